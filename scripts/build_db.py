@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import csv
+import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 
 # Local config for canonical file locations
 try:
-    from scripts.config import FILES, DATA_PROCESSED, ROOT
+    from scripts.config import DB_PATH, FILES, DATA_PROCESSED
+    from scripts.io_utils import (
+        CSV_READ_KWARGS, HAVE_ARROW, fresh_parquet, iter_csv_arrow, iter_parquet, parquet_columns,
+    )
 except ModuleNotFoundError:  # allow running as a module or script
-    from config import FILES, DATA_PROCESSED, ROOT
-
-DB_PATH = ROOT / "data" / "ai_talks.sqlite"
+    from config import DB_PATH, FILES, DATA_PROCESSED
+    from io_utils import (
+        CSV_READ_KWARGS, HAVE_ARROW, fresh_parquet, iter_csv_arrow, iter_parquet, parquet_columns,
+    )
 
 TABLE_MAP = {
     "content": {
@@ -85,64 +93,328 @@ TABLE_MAP = {
 }
 
 
-def _read_csv_safe(path: Path) -> pd.DataFrame:
+# Tables of plain text/integer columns, copied straight from their CSV rows with
+# csv.reader; pandas is only used where parsing and coercion are richer.
+CSV_DIRECT_TABLES = ("traffic", "geography", "subscriptions")
+
+
+# Secondary indices; none exist while rows are inserted, all are built afterwards
+INDEXES = {
+    "idx_content_video": "content(video_id)",
+    "idx_traffic_source": "traffic(traffic_source)",
+    "idx_geo_country": "geography(country)",
+    "idx_dates_date": "dates(date)",
+}
+
+
+# Table recording, for every loaded column, the processed-CSV column it came from
+# (NULL for an all-NULL placeholder); eda_youtube checks it before reusing the DB.
+SOURCES_TABLE = "column_sources"
+
+
+# Rows parsed per pandas chunk when streaming a processed CSV into SQLite
+CHUNK_ROWS = 50_000
+
+# SQLite column affinity for each logical dtype used in TABLE_MAP
+_SQL_TYPES = {
+    "string": "TEXT",
+    "Int64": "INTEGER",
+    "float": "REAL",
+    "datetime64[ns]": "TIMESTAMP",
+}
+
+# pandas dtype used to materialize a column that is absent from the source
+_PANDAS_DTYPES = {
+    "string": "string",
+    "Int64": "Int64",
+    "float": "float64",
+    "datetime64[ns]": "datetime64[ns]",
+}
+
+# Connection settings for the one-shot rebuild. The database is regenerated from
+# the processed CSVs whenever a build fails, so durability is traded for speed.
+# journal_mode is persistent, so the build switches back to _FINAL_JOURNAL_MODE
+# before closing; otherwise every reader would leave -wal/-shm files behind.
+_BULK_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=OFF",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "locking_mode=EXCLUSIVE",
+    "mmap_size=268435456",
+    "busy_timeout=5000",
+)
+_FINAL_JOURNAL_MODE = "DELETE"
+
+
+def _table_header(path: Path) -> Optional[List[str]]:
+    """Column names of a processed table (from its fresh Parquet copy if any), or None if absent."""
+    pq_path = fresh_parquet(path)
+    if pq_path is not None:
+        return parquet_columns(pq_path)
     if not Path(path).exists():
-        return pd.DataFrame()
-    return pd.read_csv(path)
+        return None
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _column_sources(header: List[str], meta: dict) -> Dict[str, Optional[str]]:
+    """Source column each table column is loaded from; None marks an all-NULL placeholder.
+
+    If a target column already exists with a different name in the source, the
+    placeholder is skipped so the rename can claim it (e.g. extract_from_youtube
+    adds a `traffic_source` label column that collides with our `Traffic source`
+    rename target).
+    """
+    rename = meta.get("rename") or {}
+    shadowed = {
+        target for source, target in rename.items()
+        if source != target and source in header
+    }
+    sources: Dict[str, str] = {}
+    for col in header:
+        target = rename.get(col, col)
+        if col not in shadowed and target in meta["dtypes"]:
+            sources.setdefault(target, col)
+    return {col: sources.get(col) for col in meta["dtypes"]}
+
+
+def _read_csv_safe(path: Path, meta: dict, header: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    """Stream `path` (or its fresh Parquet copy) in chunks of the columns `meta` maps."""
+    if header is None:
+        return iter(())
+    pq_path = fresh_parquet(path)
+    sources = _column_sources(header, meta)
+    usecols = [c for c in header if c in sources.values()]
+    if pq_path is not None:
+        # Parquet already carries typed columns; _coerce_types aligns them with TABLE_MAP
+        return iter_parquet(pq_path, usecols, CHUNK_ROWS)
+    dtype = {}
+    parse_dates = []
+    for col, kind in meta["dtypes"].items():
+        source = sources[col]
+        if source is None:
+            continue
+        if kind == "string":
+            dtype[source] = "string"
+        elif kind == "datetime64[ns]":
+            parse_dates.append(source)
+    if HAVE_ARROW:
+        # every column arrives as text; _coerce_types parses numbers and dates
+        return iter_csv_arrow(path, usecols)
+    return pd.read_csv(
+        path,
+        chunksize=CHUNK_ROWS,
+        usecols=usecols,
+        dtype=dtype,
+        parse_dates=parse_dates,
+        **CSV_READ_KWARGS,  # the C-engine options, as Arrow is unavailable here
+    )
+
+
+def _already_typed(series: pd.Series, dtype: str) -> bool:
+    """True when `series` needs no conversion to match the logical `dtype`."""
+    if dtype == "Int64":
+        return series.dtype == "Int64"
+    if dtype == "float":
+        return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    if dtype == "datetime64[ns]":
+        return pd.api.types.is_datetime64_any_dtype(series)
+    return series.dtype == "string"
 
 
 def _coerce_types(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
     if df.empty:
         return df
+    pending: dict = {"Int64": [], "float": [], "datetime64[ns]": [], "string": []}
     for col, dtype in dtypes.items():
         if col not in df.columns:
-            # create missing columns as NA
-            df[col] = pd.NA if dtype in ("Int64", "string") else None
-        if dtype == "Int64":
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-        elif dtype == "float":
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-        elif dtype == "datetime64[ns]":
-            df[col] = pd.to_datetime(df[col], errors="coerce")
-        elif dtype == "string":
-            df[col] = df[col].astype("string")
+            # create missing columns as NA of the target dtype
+            df[col] = pd.Series(index=df.index, dtype=_PANDAS_DTYPES[dtype])
+        elif not _already_typed(df[col], dtype):
+            pending[dtype].append(col)
+    # one vectorized conversion per target kind; the parsed results are fresh
+    # arrays, so the dtype casts reuse them instead of copying each chunk again
+    if pending["Int64"]:
+        ints = pending["Int64"]
+        df[ints] = df[ints].apply(pd.to_numeric, errors="coerce").astype("Int64", copy=False)
+    if pending["float"]:
+        floats = pending["float"]
+        df[floats] = df[floats].apply(pd.to_numeric, errors="coerce")
+    if pending["datetime64[ns]"]:
+        dates = pending["datetime64[ns]"]
+        df[dates] = df[dates].apply(pd.to_datetime, errors="coerce", cache=True)
+    if pending["string"]:
+        strings = pending["string"]
+        df[strings] = df[strings].astype("string", copy=False)
     return df
 
 
+def _prepare_chunk(df: pd.DataFrame, meta: dict) -> pd.DataFrame:
+    """Rename, coerce and reorder one chunk to the table's stable schema."""
+    rename = meta.get("rename") or {}
+    df = df.rename(columns={k: v for k, v in rename.items() if k in df.columns})
+    df = _coerce_types(df, meta["dtypes"])
+    return df[list(meta["dtypes"])]
+
+
+def _load_table(meta: dict) -> Tuple[Dict[str, Optional[str]], List[pd.DataFrame]]:
+    """Read and prepare every chunk of one table (runs on a worker thread).
+
+    Returns the table's _column_sources alongside the chunks.
+    """
+    header = _table_header(meta["path"])  # type: ignore[arg-type]
+    chunks = [
+        _prepare_chunk(chunk, meta)
+        for chunk in _read_csv_safe(meta["path"], meta, header)  # type: ignore[arg-type]
+        if not chunk.empty
+    ]
+    return _column_sources(header or [], meta), chunks
+
+
+def _create_table(con: sqlite3.Connection, meta: dict) -> None:
+    """(Re)create an empty table whose columns follow `meta['dtypes']`."""
+    columns = ", ".join(f'"{col}" {_SQL_TYPES[kind]}' for col, kind in meta["dtypes"].items())
+    con.execute(f'DROP TABLE IF EXISTS "{meta["table"]}"')
+    con.execute(f'CREATE TABLE "{meta["table"]}" ({columns})')
+
+
+def _insert_sql(meta: dict) -> str:
+    """Single-row INSERT for a table's columns, run through con.executemany.
+
+    The statement text is identical for every chunk of a table, so sqlite3 prepares
+    it once and reuses it from its statement cache.
+    """
+    columns = list(meta["dtypes"])
+    names = ", ".join(f'"{col}"' for col in columns)
+    params = ", ".join("?" * len(columns))
+    return f'INSERT INTO "{meta["table"]}" ({names}) VALUES ({params})'
+
+
+def _sql_rows(chunk: pd.DataFrame) -> Iterator[tuple]:
+    """Rows of a prepared chunk as values sqlite3 can bind; missing values become NULL.
+
+    Timestamps are stored as ISO text ("YYYY-MM-DD HH:MM:SS"), as to_sql did.
+    """
+    columns = []
+    for col in chunk.columns:
+        series = chunk[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = [
+                None if ts is pd.NaT else ts.to_pydatetime().isoformat(" ")
+                for ts in series.tolist()
+            ]
+        else:
+            values = series.astype(object).where(series.notna(), None).tolist()
+        columns.append(values)
+    return zip(*columns)
+
+
+def _csv_text(value: str) -> Optional[str]:
+    return value or None
+
+
+def _csv_int(value: str) -> Optional[int]:
+    """Int64 coercion of one CSV field; blank or non-integral values become NULL."""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else None
+
+
+_CSV_CONVERTERS = {"string": _csv_text, "Int64": _csv_int}
+
+
+def _bulk_insert_csv(con: sqlite3.Connection, meta: dict) -> Dict[str, Optional[str]]:
+    """Insert a CSV_DIRECT_TABLES entry from its CSV rows without going through pandas.
+
+    Columns are picked and renamed by _column_sources, like _read_csv_safe does;
+    returns those sources.
+    """
+    with open(meta["path"], newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        sources = _column_sources(header, meta)
+        fields = [
+            (None if sources[col] is None else header.index(sources[col]), _CSV_CONVERTERS[kind])
+            for col, kind in meta["dtypes"].items()
+        ]
+
+        def rows():
+            for row in reader:
+                if not row:  # blank line
+                    continue
+                width = len(row)
+                yield tuple(
+                    convert(row[i]) if i is not None and i < width else None
+                    for i, convert in fields
+                )
+
+        con.executemany(_insert_sql(meta), rows())
+    return sources
+
+
+def _write_sources(con: sqlite3.Connection, sources: Dict[str, Dict[str, Optional[str]]]) -> None:
+    con.execute(f'DROP TABLE IF EXISTS "{SOURCES_TABLE}"')
+    con.execute(f'CREATE TABLE "{SOURCES_TABLE}" (table_name TEXT, column_name TEXT, source TEXT)')
+    con.executemany(
+        f'INSERT INTO "{SOURCES_TABLE}" VALUES (?, ?, ?)',
+        [
+            (table, column, source)
+            for table, columns in sources.items()
+            for column, source in columns.items()
+        ],
+    )
+
+
 def build_sqlite(db_path: Path = DB_PATH) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     con = sqlite3.connect(db_path)
+    for pragma in _BULK_PRAGMAS:
+        con.execute(f"PRAGMA {pragma}")
+    # CSV parsing and type coercion are independent per table and run on a pool;
+    # SQLite has a single writer, so this thread inserts the tables in TABLE_MAP order.
+    # Every statement of the load runs in one transaction (no to_sql, which commits
+    # after each call), so a failed build leaves the previous database untouched.
+    direct = {key for key in CSV_DIRECT_TABLES if Path(TABLE_MAP[key]["path"]).exists()}
+    workers = max(1, min(len(TABLE_MAP) - len(direct), os.cpu_count() or 1))
     try:
-        for key, meta in TABLE_MAP.items():
-            df = _read_csv_safe(meta["path"])  # type: ignore[arg-type]
-            rename = meta.get("rename") or {}
-            if not df.empty and rename:
-                # If a target column already exists with a different name in the source,
-                # drop the placeholder so the rename can claim it (e.g. extract_from_youtube
-                # adds a `traffic_source` label column that collides with our `Traffic source`
-                # rename target).
-                collisions = [
-                    target for source, target in rename.items()
-                    if source != target and source in df.columns and target in df.columns
-                ]
-                if collisions:
-                    df = df.drop(columns=collisions)
-                df = df.rename(columns={k: v for k, v in rename.items() if k in df.columns})
-            df = _coerce_types(df, meta["dtypes"])  # type: ignore[arg-type]
-            # reorder columns to stable schema
-            cols = list(meta["dtypes"].keys())
-            df = df[[c for c in cols if c in df.columns]]
-            df.to_sql(meta["table"], con, if_exists="replace", index=False)
-        # basic indices for performance
+        with ThreadPoolExecutor(max_workers=workers) as pool, con:
+            loads = {
+                key: pool.submit(_load_table, meta)
+                for key, meta in TABLE_MAP.items() if key not in direct
+            }
+            con.execute("BEGIN")
+            for name in INDEXES:
+                con.execute(f"DROP INDEX IF EXISTS {name}")
+            sources = {}
+            for key, meta in TABLE_MAP.items():
+                _create_table(con, meta)
+                if key in direct:
+                    sources[meta["table"]] = _bulk_insert_csv(con, meta)
+                    continue
+                sources[meta["table"]], chunks = loads[key].result()
+                insert = _insert_sql(meta)
+                for chunk in chunks:
+                    con.executemany(insert, _sql_rows(chunk))
+            _write_sources(con, sources)
+        # basic indices for performance, built in one transaction after the load
         try:
-            con.execute("CREATE INDEX IF NOT EXISTS idx_content_video ON content(video_id)")
-            con.execute("CREATE INDEX IF NOT EXISTS idx_traffic_source ON traffic(traffic_source)")
-            con.execute("CREATE INDEX IF NOT EXISTS idx_geo_country ON geography(country)")
-            con.execute("CREATE INDEX IF NOT EXISTS idx_dates_date ON dates(date)")
+            with con:
+                con.execute("BEGIN")
+                for name, target in INDEXES.items():
+                    con.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
         except sqlite3.DatabaseError:
             pass
     finally:
-        con.close()
+        try:
+            con.execute(f"PRAGMA journal_mode={_FINAL_JOURNAL_MODE}")
+        finally:
+            con.close()
 
 
 if __name__ == "__main__":
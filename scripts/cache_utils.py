@@ -0,0 +1,90 @@
+"""On-disk cache for work that only depends on unchanged input files.
+
+Entries live under config.CACHE_DIR and are keyed by the size and modification
+time of the files they were derived from, so editing or regenerating an input
+invalidates them automatically. Callers add whatever else shaped the result
+(read options, their own source file) to the key. Set AI_TALKS_CACHE=0 to bypass
+the cache.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+try:
+    from scripts.config import CACHE_DIR
+    from scripts.io_utils import HAVE_ARROW
+except ModuleNotFoundError:  # allow running as a module or script
+    from config import CACHE_DIR
+    from io_utils import HAVE_ARROW
+
+ENABLED = os.environ.get("AI_TALKS_CACHE", "1") == "1"
+
+
+def file_key(*paths: Path) -> str:
+    """Fingerprint `paths` by size and mtime; missing files are part of the key too."""
+    parts = []
+    for path in paths:
+        try:
+            st = Path(path).stat()
+        except FileNotFoundError:
+            parts.append("missing")
+            continue
+        parts.append(f"{st.st_size}-{st.st_mtime_ns}")
+    return "_".join(parts)
+
+
+def load_with_cache(path: Path, read: Callable[[Path], pd.DataFrame], key: str = "") -> pd.DataFrame:
+    """Return `read(path)`, reusing a Feather copy from an earlier run while `path` is unchanged.
+
+    `key` describes how `read` parses the file (its options, the code version); a copy
+    saved under a different key is not reused. Feather needs pyarrow; without it every
+    call simply reads `path`.
+    """
+    if not (ENABLED and HAVE_ARROW):
+        return read(path)
+    path = Path(path)
+    read_key = hashlib.sha1(f"{key}:{file_key(Path(__file__))}".encode()).hexdigest()[:12]
+    cached = CACHE_DIR / f"{path.stem}-{file_key(path)}-{read_key}.feather"
+    if cached.exists():
+        return pd.read_feather(cached)
+
+    df = read(path)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in CACHE_DIR.glob(f"{path.stem}-*.feather"):
+        stale.unlink(missing_ok=True)
+    tmp = cached.with_suffix(".tmp")
+    try:
+        df.to_feather(tmp)
+        os.replace(tmp, cached)
+    except (ValueError, TypeError):  # Arrow cannot represent this frame; skip caching it
+        tmp.unlink(missing_ok=True)
+    return df
+
+
+def load_pickle(name: str, key: str) -> Optional[Any]:
+    """Return the value saved under `name` if it was stored with the same `key`."""
+    if not ENABLED:
+        return None
+    try:
+        with open(CACHE_DIR / f"{name}.pkl", "rb") as fh:
+            stored_key, value = pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    return value if stored_key == key else None
+
+
+def save_pickle(name: str, key: str, value: Any) -> None:
+    """Store `value` under `name`, tagged with the `key` it is valid for."""
+    if not ENABLED:
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_DIR / f"{name}.pkl.tmp"
+    with open(tmp, "wb") as fh:
+        pickle.dump((key, value), fh)
+    os.replace(tmp, CACHE_DIR / f"{name}.pkl")
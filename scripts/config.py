@@ -1,4 +1,5 @@
 """Central configuration for file locations and shared directories."""
+import os
 from pathlib import Path
 from typing import Dict
 
@@ -9,6 +10,10 @@ DATA_RAW = ROOT / "data" / "raw"
 DATA_PROCESSED = ROOT / "data" / "processed"
 FIGURES_DIR = ROOT / "figures"
 REPORTS_DIR = ROOT / "reports"
+# SQLite build of the processed tables (see build_db)
+DB_PATH = ROOT / "data" / "ai_talks.sqlite"
+# Derived, disposable artifacts (see cache_utils); created on first use
+CACHE_DIR = ROOT / ".cache"
 
 # Ensure downstream scripts never fail because folders are missing
 for _path in (DATA_RAW, DATA_PROCESSED, FIGURES_DIR, REPORTS_DIR):
@@ -22,3 +27,7 @@ FILES: Dict[str, Path] = {
     "subscriptions": DATA_PROCESSED / "subscriptions_clean_ready.csv",
     "dates": DATA_PROCESSED / "date_clean_ready.csv",
 }
+
+# Output format for processed tables: "parquet" also writes a Parquet copy next to
+# each CSV (needs pyarrow; see io_utils), "csv" writes the CSVs only.
+PROCESSED_FMT = os.environ.get("AI_TALKS_PROCESSED_FMT", "parquet").lower()
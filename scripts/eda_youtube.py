@@ -1,11 +1,15 @@
 """Exploratory data analysis for the AI Talks YouTube campaign."""
 from __future__ import annotations
 
+import bisect
+import functools
+import itertools
 import os
 import re
+import sqlite3
 import warnings
 from pathlib import Path
-from typing import Dict, Iterable, Mapping, Optional
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
 
 import pandas as pd
 
@@ -17,7 +21,6 @@ _MPL_CACHE.mkdir(parents=True, exist_ok=True)
 import matplotlib
 
 matplotlib.use("Agg")  # headless backend suitable for CLI/CI usage
-import matplotlib.pyplot as plt
 
 try:
     import seaborn as sns
@@ -30,16 +33,20 @@ except ModuleNotFoundError:  # seaborn is optional
 
 # Local project imports (support both `python -m scripts.eda_youtube` and direct execution)
 try:
-    from scripts.config import FILES, FIGURES_DIR, REPORTS_DIR
+    from scripts.cache_utils import file_key, load_pickle, load_with_cache, save_pickle
+    from scripts.config import DB_PATH, FILES, FIGURES_DIR, REPORTS_DIR
+    from scripts.io_utils import CSV_READ_KWARGS, HAVE_ARROW, dedupe_columns, fresh_parquet, parquet_path
     from scripts.plotting_utils import (
         PALETTE, THOUSANDS, add_source, add_titles, annotate_bars_h,
-        apply_theme, bar_colors, savefig, set_wide, style_axes,
+        apply_theme, bar_colors, new_figure, savefig, set_wide, style_axes,
     )
 except ModuleNotFoundError:
-    from config import FILES, FIGURES_DIR, REPORTS_DIR
+    from cache_utils import file_key, load_pickle, load_with_cache, save_pickle
+    from config import DB_PATH, FILES, FIGURES_DIR, REPORTS_DIR
+    from io_utils import CSV_READ_KWARGS, HAVE_ARROW, dedupe_columns, fresh_parquet, parquet_path
     from plotting_utils import (
         PALETTE, THOUSANDS, add_source, add_titles, annotate_bars_h,
-        apply_theme, bar_colors, savefig, set_wide, style_axes,
+        apply_theme, bar_colors, new_figure, savefig, set_wide, style_axes,
     )
 
 # Shared editorial caption used on every chart
@@ -47,38 +54,62 @@ SOURCE_LINE = "Source: YouTube Analytics  ·  AI Talks campaign  ·  Feb–Sep 2
 
 RESOLVED: Dict[str, str] = {}
 
+# Column names tried, in order, for the dates table's date column
+DATE_CANDIDATES = ("date", "day", "report_date")
+
 
 # --------------------------------------------------------------------------- #
 # Column resolution utilities
 # --------------------------------------------------------------------------- #
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=4096)
 def _normalize(text: str) -> str:
     """Simplify strings to improve fuzzy column matching."""
-    return re.sub(r"[^a-z0-9]+", "", text.lower())
+    return _NORM_RE.sub("", text.lower())
+
+
+def _column_map(df: pd.DataFrame) -> Dict[str, str]:
+    """Map normalized column names to their original labels (first occurrence wins)."""
+    normalized: Dict[str, str] = {}
+    if df.empty or not df.columns.size:
+        return normalized
+    for col in df.columns:
+        normalized.setdefault(_normalize(col), col)
+    return normalized
 
 
 def _find_col(df: pd.DataFrame, candidates: Iterable[str]) -> Optional[str]:
     """Return the first matching column from candidates using lenient but safe heuristics."""
-    if df.empty or not df.columns.size:
-        return None
+    return _find_col_cached(_column_map(df), candidates)
 
-    normalized: Dict[str, str] = {}
-    for col in df.columns:
-        key = _normalize(col)
-        if key not in normalized:
-            normalized[key] = col
+
+def _find_col_cached(normalized: Mapping[str, str], candidates: Iterable[str]) -> Optional[str]:
+    """Like _find_col, but against a precomputed _column_map of the dataframe."""
+    if not normalized:
+        return None
 
     for cand in candidates:
         norm = _normalize(cand)
         if norm in normalized:
             return normalized[norm]
 
+    # Substring fallback. All normalized names are joined by a separator that
+    # _normalize never emits, so a single str.find locates the first column that
+    # contains the candidate; only the columns before it still need the reverse check.
+    keys = list(normalized)
+    haystack = "\0".join(keys)
+    starts = list(itertools.accumulate((len(k) + 1 for k in keys[:-1]), initial=0))
     for cand in candidates:
         norm = _normalize(cand)
         if len(norm) < 3:
             continue
-        for col_norm, original in normalized.items():
-            if norm in col_norm or col_norm in norm:
-                return original
+        pos = haystack.find(norm)
+        first = bisect.bisect_right(starts, pos) - 1 if pos >= 0 else len(keys)
+        first = next((i for i in range(first) if keys[i] in norm), first)
+        if first < len(keys):
+            return normalized[keys[first]]
 
     return None
 
@@ -86,36 +117,58 @@ def _find_col(df: pd.DataFrame, candidates: Iterable[str]) -> Optional[str]:
 # --------------------------------------------------------------------------- #
 # Validation / loading
 # --------------------------------------------------------------------------- #
-def validate_inputs(dfs: Mapping[str, pd.DataFrame]) -> None:
-    """Populate RESOLVED with the best-effort column names present in each dataframe."""
-    RESOLVED.clear()
-    messages = []
+def _print_schema_warnings(messages: List[str]) -> None:
+    if messages:
+        print("\n[EDA] Schema warnings (continuing with best effort):\n  - " + "\n  - ".join(messages) + "\n")
 
-    # content
-    content = dfs.get("content")
-    if content is None:
-        messages.append("missing dataframe: content")
-    else:
-        RESOLVED["content.views"] = _find_col(
-            content,
-            ("views", "view_count", "views_total", "views_sum"),
-        ) or ""
-        if not RESOLVED["content.views"]:
-            messages.append("content missing a views column (tried: views, view_count, views_total, views_sum)")
-        RESOLVED["content.title"] = _find_col(
-            content,
-            ("title", "video_title", "video title", "name", "videoname"),
-        ) or "title"
-        RESOLVED["content.video_id"] = _find_col(
-            content,
-            ("video_id", "video id", "content", "content_id", "id", "videoid"),
-        ) or "video_id"
-        RESOLVED["content.likes"] = _find_col(
-            content,
-            ("likes", "like_count", "likes_total"),
-        ) or "likes"
-        RESOLVED["content.avg_dur"] = _find_col(
-            content,
+
+def _first_text_column(df: pd.DataFrame) -> Optional[str]:
+    return next((c for c in df.columns if df[c].dtype == "object"), None)
+
+
+def _first_numeric_column(df: pd.DataFrame) -> Optional[str]:
+    return next((c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])), None)
+
+
+def _numeric_sub_column(df: pd.DataFrame) -> Optional[str]:
+    return next(
+        (c for c in df.columns if "sub" in c.lower() and pd.api.types.is_numeric_dtype(df[c])),
+        None,
+    )
+
+
+def _date_like_column(df: pd.DataFrame) -> Optional[str]:
+    return _find_col(df, ("dt", "timestamp"))
+
+
+class ColumnRule(NamedTuple):
+    """How one logical column is resolved; `key` is its name in RESOLVED."""
+
+    key: str
+    candidates: Tuple[str, ...]
+    default: str = ""  # used silently when nothing matches
+    missing: str = ""  # warning when nothing matches
+    fallback: Optional[Callable[[pd.DataFrame], Optional[str]]] = None
+    fallback_note: str = ""  # warning when `fallback` supplies the column ("{col}" is filled in)
+
+
+SCHEMA: Dict[str, Tuple[ColumnRule, ...]] = {
+    "content": (
+        ColumnRule(
+            "content.views", ("views", "view_count", "views_total", "views_sum"),
+            missing="content missing a views column (tried: views, view_count, views_total, views_sum)",
+        ),
+        ColumnRule(
+            "content.title", ("title", "video_title", "video title", "name", "videoname"),
+            default="title",
+        ),
+        ColumnRule(
+            "content.video_id", ("video_id", "video id", "content", "content_id", "id", "videoid"),
+            default="video_id",
+        ),
+        ColumnRule("content.likes", ("likes", "like_count", "likes_total"), default="likes"),
+        ColumnRule(
+            "content.avg_dur",
             (
                 "avg_view_duration",
                 "average_view_duration",
@@ -123,33 +176,22 @@ def validate_inputs(dfs: Mapping[str, pd.DataFrame]) -> None:
                 "avg_view_duration_sec",
                 "duration",
             ),
-        ) or "avg_view_duration"
-
-    # traffic
-    traffic = dfs.get("traffic")
-    if traffic is None:
-        messages.append("missing dataframe: traffic")
-    else:
-        RESOLVED["traffic.source"] = _find_col(
-            traffic,
-            ("traffic_source", "source", "traffic_source_type"),
-        ) or ""
-        RESOLVED["traffic.views"] = _find_col(
-            traffic,
-            ("views", "view_count"),
-        ) or ""
-        if not RESOLVED["traffic.source"]:
-            messages.append("traffic missing a source column (tried: traffic_source, source, traffic_source_type)")
-        if not RESOLVED["traffic.views"]:
-            messages.append("traffic missing a views column (tried: views, view_count)")
-
-    # geography
-    geography = dfs.get("geography")
-    if geography is None:
-        messages.append("missing dataframe: geography")
-    else:
-        RESOLVED["geo.country"] = _find_col(
-            geography,
+            default="avg_view_duration",
+        ),
+    ),
+    "traffic": (
+        ColumnRule(
+            "traffic.source", ("traffic_source", "source", "traffic_source_type"),
+            missing="traffic missing a source column (tried: traffic_source, source, traffic_source_type)",
+        ),
+        ColumnRule(
+            "traffic.views", ("views", "view_count"),
+            missing="traffic missing a views column (tried: views, view_count)",
+        ),
+    ),
+    "geography": (
+        ColumnRule(
+            "geo.country",
             (
                 "country",
                 "country_name",
@@ -160,33 +202,24 @@ def validate_inputs(dfs: Mapping[str, pd.DataFrame]) -> None:
                 "region_name",
                 "region_code",
             ),
-        ) or ""
-        RESOLVED["geo.views"] = _find_col(
-            geography,
-            ("views", "view_count"),
-        ) or ""
-        if not RESOLVED["geo.country"]:
-            obj_cols = [c for c in geography.columns if geography[c].dtype == "object"]
-            if obj_cols:
-                RESOLVED["geo.country"] = obj_cols[0]
-                messages.append(
-                    f"geography country not found; using first text column: {obj_cols[0]}"
-                )
-            else:
-                messages.append(
-                    "geography missing a country-like column (tried: country, country_name, country_code, geo, location, region, region_name, region_code)"
-                )
-        if not RESOLVED["geo.views"]:
-            messages.append("geography missing a views column (tried: views, view_count)")
-
-    # dates
-    dates = dfs.get("dates")
-    if dates is None:
-        messages.append("missing dataframe: dates")
-    else:
-        RESOLVED["dates.date"] = _find_col(dates, ("date", "day", "report_date")) or ""
-        RESOLVED["dates.subs"] = _find_col(
-            dates,
+            missing="geography missing a country-like column (tried: country, country_name, country_code, geo, location, region, region_name, region_code)",
+            fallback=_first_text_column,
+            fallback_note="geography country not found; using first text column: {col}",
+        ),
+        ColumnRule(
+            "geo.views", ("views", "view_count"),
+            missing="geography missing a views column (tried: views, view_count)",
+        ),
+    ),
+    "dates": (
+        ColumnRule(
+            "dates.date", DATE_CANDIDATES,
+            missing="dates missing a date column (tried: date, day, report_date)",
+            fallback=_date_like_column,
+            fallback_note="dates date not found; using: {col}",
+        ),
+        ColumnRule(
+            "dates.subs",
             (
                 "subs_gained",
                 "subscribers_gained",
@@ -197,35 +230,14 @@ def validate_inputs(dfs: Mapping[str, pd.DataFrame]) -> None:
                 "net_subscribers",
                 "subscribers_net",
             ),
-        ) or ""
-        if not RESOLVED["dates.date"]:
-            like_date = _find_col(dates, ("dt", "timestamp")) or ""
-            if like_date:
-                RESOLVED["dates.date"] = like_date
-                messages.append(f"dates date not found; using: {like_date}")
-            else:
-                messages.append("dates missing a date column (tried: date, day, report_date)")
-        if not RESOLVED["dates.subs"]:
-            candidates = [
-                c
-                for c in dates.columns
-                if ("sub" in c.lower()) and pd.api.types.is_numeric_dtype(dates[c])
-            ]
-            if candidates:
-                RESOLVED["dates.subs"] = candidates[0]
-                messages.append(
-                    f"dates subscribers-gained not found; using numeric column containing 'sub': {candidates[0]}"
-                )
-            else:
-                messages.append("dates missing a subscribers-gained column (tried multiple variants and heuristics)")
-
-    # subscriptions
-    subscriptions = dfs.get("subscriptions")
-    if subscriptions is None:
-        messages.append("missing dataframe: subscriptions")
-    else:
-        RESOLVED["subscriptions.audience"] = _find_col(
-            subscriptions,
+            missing="dates missing a subscribers-gained column (tried multiple variants and heuristics)",
+            fallback=_numeric_sub_column,
+            fallback_note="dates subscribers-gained not found; using numeric column containing 'sub': {col}",
+        ),
+    ),
+    "subscriptions": (
+        ColumnRule(
+            "subscriptions.audience",
             (
                 "audience_type",
                 "viewer_status",
@@ -233,48 +245,93 @@ def validate_inputs(dfs: Mapping[str, pd.DataFrame]) -> None:
                 "subscriber_status",
                 "status",
             ),
-        ) or ""
-        RESOLVED["subscriptions.views"] = _find_col(
-            subscriptions,
-            ("views", "view_count", "views_total", "views_sum"),
-        ) or ""
-        if not RESOLVED["subscriptions.audience"]:
-            obj_cols = [c for c in subscriptions.columns if subscriptions[c].dtype == "object"]
-            if obj_cols:
-                RESOLVED["subscriptions.audience"] = obj_cols[0]
-                messages.append(
-                    f"subscriptions audience column not found; using first text column: {obj_cols[0]}"
-                )
-            else:
-                messages.append(
-                    "subscriptions missing an audience column (tried viewer_status, subscription_status, subscriber_status, status)"
-                )
-        if not RESOLVED["subscriptions.views"]:
-            numeric_cols = [
-                c for c in subscriptions.columns if pd.api.types.is_numeric_dtype(subscriptions[c])
-            ]
-            if numeric_cols:
-                RESOLVED["subscriptions.views"] = numeric_cols[0]
-                messages.append(
-                    f"subscriptions views metric not found; using first numeric column: {numeric_cols[0]}"
-                )
-            else:
-                messages.append("subscriptions missing a numeric metric column (tried views variants)")
+            missing="subscriptions missing an audience column (tried viewer_status, subscription_status, subscriber_status, status)",
+            fallback=_first_text_column,
+            fallback_note="subscriptions audience column not found; using first text column: {col}",
+        ),
+        ColumnRule(
+            "subscriptions.views", ("views", "view_count", "views_total", "views_sum"),
+            missing="subscriptions missing a numeric metric column (tried views variants)",
+            fallback=_first_numeric_column,
+            fallback_note="subscriptions views metric not found; using first numeric column: {col}",
+        ),
+    ),
+}
 
-    if messages:
-        print("\n[EDA] Schema warnings (continuing with best effort):\n  - " + "\n  - ".join(messages) + "\n")
+
+def validate_inputs(dfs: Mapping[str, pd.DataFrame]) -> List[str]:
+    """Populate RESOLVED with the best-effort column names present in each dataframe.
+
+    Columns are resolved according to SCHEMA. Returns the schema warnings, which
+    are also printed.
+    """
+    RESOLVED.clear()
+    messages = []
+    for name, rules in SCHEMA.items():
+        df = dfs.get(name)
+        if df is None:
+            messages.append(f"missing dataframe: {name}")
+            continue
+        normalized = _column_map(df)
+        for rule in rules:
+            col = _find_col_cached(normalized, rule.candidates)
+            if not col and rule.fallback is not None:
+                col = rule.fallback(df)
+                if col:
+                    messages.append(rule.fallback_note.format(col=col))
+            if not col:
+                col = rule.default
+                if rule.missing:
+                    messages.append(rule.missing)
+            RESOLVED[rule.key] = col
+
+    _print_schema_warnings(messages)
+    return messages
+
+
+def _date_read_kwargs(path: Path) -> Dict[str, object]:
+    """read_csv options that parse the dates table's date column while reading it."""
+    normalized: Dict[str, str] = {}
+    for col in pd.read_csv(path, nrows=0).columns:
+        normalized.setdefault(_normalize(col), col)
+    dcol = _find_col_cached(normalized, DATE_CANDIDATES)
+    if not dcol:
+        return {}
+    return {"parse_dates": [dcol], "date_format": "ISO8601"}
+
+
+def _read_csv(path: Path, read_kwargs: Mapping[str, object]) -> pd.DataFrame:
+    df = pd.read_csv(path, **read_kwargs)
+    # engine="pyarrow" keeps repeated header names; label them like the C parser
+    df.columns = dedupe_columns(df.columns)
+    return df
 
 
 def load_data() -> Dict[str, pd.DataFrame]:
-    """Read every dataframe declared in config.FILES, skipping any that are absent."""
+    """Read every dataframe declared in config.FILES, skipping any that are absent.
+
+    A fresh Parquet copy of a processed CSV (see io_utils) is preferred over the CSV;
+    otherwise parsed CSVs are reused from the on-disk cache while unchanged.
+    """
     dfs: Dict[str, pd.DataFrame] = {}
     missing = []
     for name, path in FILES.items():
         try:
+            pq_path = fresh_parquet(path)
+            if pq_path is not None:
+                dfs[name] = pd.read_parquet(pq_path, engine="pyarrow")
+                continue
             if not path.exists():
                 missing.append(f"{name}: {path}")
                 continue
-            dfs[name] = pd.read_csv(path)
+            read_kwargs = dict(CSV_READ_KWARGS)
+            if name == "dates":
+                read_kwargs.update(_date_read_kwargs(path))
+            dfs[name] = load_with_cache(
+                path,
+                lambda p, kw=read_kwargs: _read_csv(p, kw),
+                key=f"{sorted(read_kwargs.items())!r}:{file_key(Path(__file__))}",
+            )
         except FileNotFoundError:
             missing.append(f"{name}: {path}")
         except Exception as exc:
@@ -286,11 +343,51 @@ def load_data() -> Dict[str, pd.DataFrame]:
     return dfs
 
 
+# Label columns that are grouped and drawn as axis labels, by dataset.
+LABEL_COLUMNS = {
+    "traffic": "traffic.source",
+    "geography": "geo.country",
+    "subscriptions": "subscriptions.audience",
+}
+
+
+def categorize_labels(dfs: Dict[str, pd.DataFrame]) -> None:
+    """Store the resolved label columns as categoricals, in place.
+
+    Each distinct source/country/audience name is then held once, groupby works on
+    the integer codes, and the plots reuse the string categories as axis labels.
+    """
+    for name, key in LABEL_COLUMNS.items():
+        df = dfs.get(name)
+        col = RESOLVED.get(key)
+        if df is None or not col or col not in df.columns:
+            continue
+        labels = df[col]
+        if not isinstance(labels.dtype, pd.CategoricalDtype):
+            labels = labels.astype("category")
+        if not all(isinstance(c, str) for c in labels.cat.categories):
+            labels = labels.cat.rename_categories(str)
+        df[col] = labels
+
+
 # --------------------------------------------------------------------------- #
 # KPI helpers and plotting
 # --------------------------------------------------------------------------- #
-def kpi_table(dfs: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
-    """Compute a light-weight set of KPIs shared with downstream reporting."""
+def group_totals(df: pd.DataFrame, group_col: str, value_col: str) -> pd.DataFrame:
+    """Sum `value_col` per `group_col`, unsorted; computed once and shared by plots and exports."""
+    if df.empty or group_col not in df.columns or value_col not in df.columns:
+        return pd.DataFrame(columns=[group_col, value_col])
+    return df.groupby(group_col, as_index=False, observed=True)[value_col].sum(min_count=1)
+
+
+def kpi_table(
+    dfs: Mapping[str, pd.DataFrame],
+    subs_totals: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """Compute a light-weight set of KPIs shared with downstream reporting.
+
+    `subs_totals` is the group_totals() of subscriptions by audience, if already computed.
+    """
     content = dfs.get("content", pd.DataFrame())
     dates = dfs.get("dates", pd.DataFrame())
     subscriptions = dfs.get("subscriptions", pd.DataFrame())
@@ -310,17 +407,20 @@ def kpi_table(dfs: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
     subs_total_gain = dates[subs_col].sum() if subs_col in dates else 0
 
     subscribed_view_share = None
+    if subs_totals is None and subs_audience:
+        subs_totals = group_totals(subscriptions, subs_audience, subs_metric)
     if (
-        not subscriptions.empty
-        and subs_audience
-        and subs_audience in subscriptions.columns
-        and subs_metric in subscriptions.columns
+        subs_totals is not None
+        and not subs_totals.empty
+        and subs_audience in subs_totals.columns
+        and subs_metric in subs_totals.columns
     ):
-        grouped = subscriptions.groupby(subs_audience)[subs_metric].sum(min_count=1)
+        grouped = subs_totals.set_index(subs_audience)[subs_metric]
         total_metric = grouped.sum()
         if total_metric:
-            subscribed_metric = grouped[[idx for idx in grouped.index if "sub" in str(idx).lower()]].sum()
-            subscribed_view_share = subscribed_metric / total_metric if total_metric else None
+            labels = grouped.index.astype(str).str.lower()
+            subscribed_metric = grouped.loc[labels.str.contains("sub", na=False)].sum()
+            subscribed_view_share = subscribed_metric / total_metric
 
     return pd.DataFrame(
         {
@@ -334,6 +434,129 @@ def kpi_table(dfs: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
     )
 
 
+# KPI inputs the build_db database can answer: RESOLVED key -> (table, column).
+# The dataset a key belongs to has the same name as its table.
+_DB_KPI_COLUMNS = {
+    "content.video_id": ("content", "video_id"),
+    "content.views": ("content", "views"),
+    "content.likes": ("content", "likes"),
+    "content.avg_dur": ("content", "avg_view_duration"),
+    "dates.subs": ("dates", "subs_gained"),
+    "subscriptions.audience": ("subscriptions", "audience_type"),
+    "subscriptions.views": ("subscriptions", "views"),
+}
+
+# Database columns build_db stores as INTEGER (fractional values do not survive)
+_DB_INTEGER_COLUMNS = {("content", "views"), ("content", "likes"), ("subscriptions", "views")}
+
+
+def db_is_current(db_path: Path = DB_PATH) -> bool:
+    """True when the SQLite build exists and is at least as new as every input file."""
+    try:
+        db_mtime = db_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    inputs = [*FILES.values(), *map(parquet_path, FILES.values())]
+    return all(db_mtime >= path.stat().st_mtime_ns for path in inputs if path.exists())
+
+
+def _db_matches(sources: Mapping[Tuple[str, str], Optional[str]], dfs: Mapping[str, pd.DataFrame]) -> bool:
+    """True when the database holds exactly what kpi_table() would aggregate.
+
+    Every KPI column must have been loaded from the column RESOLVED picked (or be an
+    all-NULL placeholder where kpi_table falls back), with a dtype the SQL aggregates
+    treat the same way as pandas does.
+    """
+    for key, (table, column) in _DB_KPI_COLUMNS.items():
+        frame = dfs.get(table, pd.DataFrame())
+        resolved = RESOLVED.get(key)
+        expected = resolved if resolved and resolved in frame.columns else None
+        if sources.get((table, column)) != expected:
+            return False
+        if expected is None or key == "subscriptions.audience":
+            continue
+        series = frame[expected]
+        if key == "content.video_id":
+            # distinct counts compare the CSV text; parsed numbers may merge ("1", "01")
+            if pd.api.types.is_numeric_dtype(series):
+                return False
+            continue
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return False
+        if (table, column) in _DB_INTEGER_COLUMNS and pd.api.types.is_float_dtype(series):
+            if not (series.dropna() % 1 == 0).all():
+                return False
+    return True
+
+
+def _like_pandas(value, dfs: Mapping[str, pd.DataFrame], key: str):
+    """A SQL sum as kpi_table() reports it: 0 when empty, float for a float column."""
+    table = _DB_KPI_COLUMNS[key][0]
+    col = RESOLVED.get(key)
+    frame = dfs.get(table, pd.DataFrame())
+    if not col or col not in frame.columns:
+        return 0
+    if pd.api.types.is_float_dtype(frame[col]):
+        return float(value or 0)
+    return value or 0
+
+
+def kpi_from_db(dfs: Mapping[str, pd.DataFrame], db_path: Path = DB_PATH) -> Optional[pd.DataFrame]:
+    """kpi_table() computed with aggregate queries against the build_db database.
+
+    Returns None, so the caller falls back to kpi_table(), unless the database was
+    built from the same columns (and compatible dtypes) that RESOLVED picks in `dfs`.
+    """
+    try:
+        con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        sources = {
+            (table, column): source
+            for table, column, source in con.execute(
+                "SELECT table_name, column_name, source FROM column_sources"
+            )
+        }
+        if not _db_matches(sources, dfs):
+            return None
+        id_source = sources.get(("content", "video_id"))
+        total_videos, total_views, total_likes, avg_view_duration = con.execute(
+            f"SELECT {'COUNT(DISTINCT video_id)' if id_source else 'COUNT(*)'}, SUM(views),"
+            " SUM(likes), AVG(avg_view_duration) FROM content"
+        ).fetchone()
+        audience_totals = con.execute(
+            "SELECT audience_type, SUM(views) FROM subscriptions"
+            " WHERE audience_type IS NOT NULL GROUP BY audience_type"
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+    finally:
+        con.close()
+
+    # the dates table never carries subscriber gains (a match means kpi_table has none)
+    subs_total_gain = 0
+    # label matching stays in Python: SQLite's lower() only folds ASCII
+    subscribed_view_share = None
+    if RESOLVED.get("subscriptions.audience") and RESOLVED.get("subscriptions.views"):
+        totals = [(str(label), metric) for label, metric in audience_totals if metric is not None]
+        total_metric = sum(metric for _, metric in totals)
+        if total_metric:
+            subscribed = sum(metric for label, metric in totals if "sub" in label.lower())
+            subscribed_view_share = subscribed / total_metric
+
+    return pd.DataFrame(
+        {
+            "total_videos": [total_videos],
+            "total_views": [_like_pandas(total_views, dfs, "content.views")],
+            "total_likes": [_like_pandas(total_likes, dfs, "content.likes")],
+            "avg_view_duration_sec": [avg_view_duration],
+            "subs_total_gain": [subs_total_gain],
+            "subscribed_view_share": [subscribed_view_share],
+        }
+    )
+
+
 # ISO-2 → friendly country name for the small set we currently surface.
 _COUNTRY_NAMES = {
     "US": "United States", "IN": "India", "ET": "Ethiopia",
@@ -369,8 +592,7 @@ def plot_top_videos(content: pd.DataFrame, top_n: int = 10) -> None:
         content.groupby(tcol, as_index=False)[vcol]
         .sum(min_count=1)
         .dropna(subset=[vcol])
-        .sort_values(vcol, ascending=False)
-        .head(top_n)
+        .nlargest(top_n, vcol)
         .sort_values(vcol, ascending=True)  # ascending so largest sits at top in barh
     )
     if grp.empty:
@@ -382,7 +604,7 @@ def plot_top_videos(content: pd.DataFrame, top_n: int = 10) -> None:
 
     apply_theme()
     height = max(4.5, 0.55 * len(grp) + 3.0)
-    fig, ax = plt.subplots(figsize=(14, height))
+    fig, ax = new_figure((14, height))
     fig.subplots_adjust(top=0.78, left=0.32, right=0.95, bottom=0.16)
 
     ax.barh(
@@ -403,29 +625,30 @@ def plot_top_videos(content: pd.DataFrame, top_n: int = 10) -> None:
         subtitle="Top episodes by views originating from YouTube playlists",
     )
     add_source(fig, SOURCE_LINE)
-    savefig(FIGURES_DIR / "top_videos_by_views.png")
+    savefig(FIGURES_DIR / "top_videos_by_views.png", fig)
+
 
+def plot_traffic_sources(totals: pd.DataFrame) -> None:
+    """Views by traffic source — External highlighted as the largest contributor.
 
-def plot_traffic_sources(traffic: pd.DataFrame) -> None:
-    """Views by traffic source — External highlighted as the largest contributor."""
+    `totals` is the group_totals() of traffic views by source.
+    """
     src = RESOLVED.get("traffic.source", "traffic_source")
     vcol = RESOLVED.get("traffic.views", "views")
-    if traffic.empty or src not in traffic.columns or vcol not in traffic.columns:
+    if totals.empty or src not in totals.columns or vcol not in totals.columns:
         return
 
-    grp = (
-        traffic.groupby(src, as_index=False)[vcol]
-        .sum()
-        .sort_values(vcol, ascending=True)
-    )
-    labels = grp[src].astype(str).tolist()
+    grp = totals.dropna(subset=[vcol]).sort_values(vcol, ascending=True)
+    if grp.empty:
+        return
+    labels = grp[src].tolist()
     values = grp[vcol].tolist()
     total = float(sum(values)) or 1.0
     leader = grp.iloc[-1][src]
     leader_share = grp.iloc[-1][vcol] / total
 
     apply_theme()
-    fig, ax = plt.subplots(figsize=(14, 7.5))
+    fig, ax = new_figure((14, 7.5))
     fig.subplots_adjust(top=0.78, left=0.22, right=0.95, bottom=0.12)
 
     ax.barh(
@@ -446,29 +669,27 @@ def plot_traffic_sources(traffic: pd.DataFrame) -> None:
         subtitle="Views by YouTube traffic source",
     )
     add_source(fig, SOURCE_LINE)
-    savefig(FIGURES_DIR / "traffic_sources.png")
+    savefig(FIGURES_DIR / "traffic_sources.png", fig)
+
 
+def plot_top_countries(totals: pd.DataFrame, top_n: int = 10) -> None:
+    """Views by viewer country, with ISO codes mapped to readable names.
 
-def plot_top_countries(geography: pd.DataFrame, top_n: int = 10) -> None:
-    """Views by viewer country, with ISO codes mapped to readable names."""
+    `totals` is the group_totals() of geography views by country.
+    """
     ccol = RESOLVED.get("geo.country", "")
     vcol = RESOLVED.get("geo.views", "")
     if (
-        geography.empty or not ccol or not vcol
-        or ccol not in geography.columns or vcol not in geography.columns
+        totals.empty or not ccol or not vcol
+        or ccol not in totals.columns or vcol not in totals.columns
     ):
         return
 
-    grp = (
-        geography.groupby(ccol, as_index=False)[vcol]
-        .sum()
-        .sort_values(vcol, ascending=False)
-        .head(top_n)
-    )
+    grp = totals.dropna(subset=[vcol]).nlargest(top_n, vcol)
     if grp.empty:
         return
 
-    grp[ccol] = grp[ccol].astype(str).map(lambda c: _COUNTRY_NAMES.get(c.upper(), c))
+    grp[ccol] = grp[ccol].map(lambda c: _COUNTRY_NAMES.get(c.upper(), c), na_action="ignore")
     grp = grp.sort_values(vcol, ascending=True)
     labels = grp[ccol].tolist()
     values = grp[vcol].tolist()
@@ -478,7 +699,7 @@ def plot_top_countries(geography: pd.DataFrame, top_n: int = 10) -> None:
 
     apply_theme()
     height = max(3.5, 0.7 * len(grp) + 2.8)
-    fig, ax = plt.subplots(figsize=(14, height))
+    fig, ax = new_figure((14, height))
     fig.subplots_adjust(top=0.74, left=0.22, right=0.95, bottom=0.18)
 
     ax.barh(
@@ -499,7 +720,7 @@ def plot_top_countries(geography: pd.DataFrame, top_n: int = 10) -> None:
         subtitle=f"Views by viewer country  ·  top {len(grp)} of {len(grp)} reported",
     )
     add_source(fig, SOURCE_LINE)
-    savefig(FIGURES_DIR / "top_countries.png")
+    savefig(FIGURES_DIR / "top_countries.png", fig)
 
 
 def plot_views_over_time(dates: pd.DataFrame) -> None:
@@ -518,7 +739,7 @@ def plot_views_over_time(dates: pd.DataFrame) -> None:
     peak_val = float(tmp.loc[peak_idx, "Views"])
 
     apply_theme()
-    fig, ax = plt.subplots(figsize=(14, 5.8))
+    fig, ax = new_figure((14, 5.8))
     fig.subplots_adjust(top=0.78, left=0.08, right=0.95, bottom=0.16)
 
     ax.bar(
@@ -553,23 +774,24 @@ def plot_views_over_time(dates: pd.DataFrame) -> None:
         subtitle="Total daily views with 7-day moving average",
     )
     add_source(fig, SOURCE_LINE)
-    savefig(FIGURES_DIR / "views_over_time.png")
+    savefig(FIGURES_DIR / "views_over_time.png", fig)
+
 
+def plot_subscriber_breakdown(totals: pd.DataFrame) -> None:
+    """100%-stacked single bar showing subscriber vs non-subscriber view share.
 
-def plot_subscriber_breakdown(subscriptions: pd.DataFrame) -> None:
-    """100%-stacked single bar showing subscriber vs non-subscriber view share."""
+    `totals` is the group_totals() of subscription views by audience type.
+    """
     audience_col = RESOLVED.get("subscriptions.audience")
     metric_col = RESOLVED.get("subscriptions.views", "views")
     if (
-        subscriptions.empty or not audience_col
-        or audience_col not in subscriptions.columns
-        or metric_col not in subscriptions.columns
+        totals.empty or not audience_col
+        or audience_col not in totals.columns
+        or metric_col not in totals.columns
     ):
         return
 
-    grp = subscriptions.groupby(audience_col)[metric_col].sum(min_count=1)
-    if grp.empty:
-        return
+    grp = totals.set_index(audience_col)[metric_col]
 
     sub_keys = [k for k in grp.index if "sub" in str(k).lower() and "not" not in str(k).lower()]
     sub = float(grp[sub_keys].sum()) if sub_keys else 0.0
@@ -580,7 +802,7 @@ def plot_subscriber_breakdown(subscriptions: pd.DataFrame) -> None:
     sub_share = sub / total
 
     apply_theme()
-    fig, ax = plt.subplots(figsize=(14, 3.0))
+    fig, ax = new_figure((14, 3.0))
     fig.subplots_adjust(top=0.55, left=0.05, right=0.95, bottom=0.30)
 
     bar_height = 0.55
@@ -614,21 +836,17 @@ def plot_subscriber_breakdown(subscriptions: pd.DataFrame) -> None:
         y_title=0.90, y_subtitle=0.74,
     )
     add_source(fig, SOURCE_LINE)
-    savefig(FIGURES_DIR / "subscriber_breakdown.png")
+    savefig(FIGURES_DIR / "subscriber_breakdown.png", fig)
 
 
 # --------------------------------------------------------------------------- #
 # Tabular exports
 # --------------------------------------------------------------------------- #
-def export_group_summary(df: pd.DataFrame, group_col: str, value_col: str, output_name: str) -> None:
-    """Write grouped summaries to the reports directory for downstream reporting."""
-    if df.empty or group_col not in df.columns or value_col not in df.columns:
+def export_group_summary(totals: pd.DataFrame, value_col: str, output_name: str) -> None:
+    """Write a group_totals() summary, largest first, to the reports directory."""
+    if totals.empty or value_col not in totals.columns:
         return
-    summary = (
-        df.groupby(group_col, as_index=False)[value_col]
-        .sum(min_count=1)
-        .sort_values(value_col, ascending=False)
-    )
+    summary = totals.sort_values(value_col, ascending=False)
     summary.to_csv(REPORTS_DIR / output_name, index=False)
 
 
@@ -638,7 +856,20 @@ def export_group_summary(df: pd.DataFrame, group_col: str, value_col: str, outpu
 def main() -> None:
     """Run the entire EDA workflow: load data, validate schemas, and produce outputs."""
     dfs = load_data()
-    validate_inputs(dfs)
+
+    # Column resolution only depends on the input files (and this module), so
+    # reuse the previous run's result while none of them changed.
+    inputs = [*FILES.values(), *map(parquet_path, FILES.values()), Path(__file__)]
+    resolve_key = f"arrow={HAVE_ARROW}:" + file_key(*inputs)
+    cached = load_pickle("resolved_columns", resolve_key)
+    if cached is not None:
+        resolved, messages = cached
+        RESOLVED.clear()
+        RESOLVED.update(resolved)
+        _print_schema_warnings(messages)
+    else:
+        messages = validate_inputs(dfs)
+        save_pickle("resolved_columns", resolve_key, (dict(RESOLVED), messages))
 
     print("[EDA] Resolved columns:")
     for key in sorted(RESOLVED):
@@ -652,6 +883,8 @@ def main() -> None:
             if pd.api.types.is_datetime64_any_dtype(series):
                 parsed = series
             else:
+                # load_data parses ISO dates while reading; only columns it could not
+                # (non-date rows, non-ISO exports, a fallback column) are parsed here.
                 parsed = pd.to_datetime(series, errors="coerce", format="ISO8601")
                 if parsed.notna().sum() == 0 and series.dropna().size:
                     with warnings.catch_warnings():
@@ -670,28 +903,40 @@ def main() -> None:
             if scol and scol in dfs["dates"].columns:
                 dfs["dates"][scol] = pd.to_numeric(dfs["dates"][scol], errors="coerce").fillna(0)
 
-    kpis = kpi_table(dfs)
+    categorize_labels(dfs)
+
+    # Each grouped summary is computed once and shared by KPIs, plots and exports
+    subs_audience = RESOLVED.get("subscriptions.audience")
+    subs_metric = RESOLVED.get("subscriptions.views", "views")
+    subs_totals = None
+    if "subscriptions" in dfs and subs_audience and subs_metric:
+        subs_totals = group_totals(dfs["subscriptions"], subs_audience, subs_metric)
+
+    # A current build_db database answers the KPIs with a few aggregate queries
+    kpis = kpi_from_db(dfs) if db_is_current() else None
+    if kpis is None:
+        kpis = kpi_table(dfs, subs_totals)
     kpis.to_csv(REPORTS_DIR / "kpis.csv", index=False)
 
     if "content" in dfs:
         plot_top_videos(dfs["content"])
     if "traffic" in dfs:
-        plot_traffic_sources(dfs["traffic"])
+        plot_traffic_sources(group_totals(
+            dfs["traffic"],
+            RESOLVED.get("traffic.source", "traffic_source"),
+            RESOLVED.get("traffic.views", "views"),
+        ))
     if "geography" in dfs:
-        plot_top_countries(dfs["geography"])
+        plot_top_countries(group_totals(
+            dfs["geography"],
+            RESOLVED.get("geo.country", ""),
+            RESOLVED.get("geo.views", ""),
+        ))
     if "dates" in dfs:
         plot_views_over_time(dfs["dates"])
-    if "subscriptions" in dfs:
-        plot_subscriber_breakdown(dfs["subscriptions"])
-        subs_audience = RESOLVED.get("subscriptions.audience")
-        subs_metric = RESOLVED.get("subscriptions.views", "views")
-        if subs_audience and subs_metric:
-            export_group_summary(
-                dfs["subscriptions"],
-                subs_audience,
-                subs_metric,
-                "subscriber_breakdown.csv",
-            )
+    if subs_totals is not None:
+        plot_subscriber_breakdown(subs_totals)
+        export_group_summary(subs_totals, subs_metric, "subscriber_breakdown.csv")
 
     print("EDA complete. Figures saved in /figures and KPIs in /reports/kpis.csv")
 
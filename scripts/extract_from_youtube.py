@@ -1,6 +1,25 @@
+import csv
+import hashlib
+import io
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+
 import pandas as pd
-import os
+
+try:
+    from scripts.config import FILES, PROCESSED_FMT
+    from scripts.io_utils import (
+        HAVE_ARROW, csv_to_parquet, fresh_parquet, read_csv_mmap, read_processed,
+        rename_parquet_columns, write_processed,
+    )
+except ModuleNotFoundError:
+    from config import FILES, PROCESSED_FMT
+    from io_utils import (
+        HAVE_ARROW, csv_to_parquet, fresh_parquet, read_csv_mmap, read_processed,
+        rename_parquet_columns, write_processed,
+    )
 
 RAW = Path("data/raw")
 PROCESSED = Path("data/processed")
@@ -8,17 +27,35 @@ RAW.mkdir(parents=True, exist_ok=True)
 PROCESSED.mkdir(parents=True, exist_ok=True)
 
 
+# Subfolders of RAW and resolve_folder() results, computed once per run
+_RAW_DIRS: list[str] | None = None
+_RESOLVED_FOLDERS: dict[tuple[str, ...], str] = {}
+
+
+def _raw_dirs() -> list[str]:
+    """Names of RAW's subfolders from a single scandir pass (entry types come with the listing)."""
+    global _RAW_DIRS
+    if _RAW_DIRS is None:
+        with os.scandir(RAW) as entries:
+            _RAW_DIRS = [entry.name for entry in entries if entry.is_dir()]
+    return _RAW_DIRS
+
+
 def resolve_folder(patterns: list[str]) -> str:
     """
     Scans RAW and returns the first subfolder whose name starts with any of the patterns (case-insensitive).
     If none are found, raises FileNotFoundError with a helpful message.
     """
-    available_dirs = [d.name for d in RAW.iterdir() if d.is_dir()]
+    key = tuple(patterns)
+    if key in _RESOLVED_FOLDERS:
+        return _RESOLVED_FOLDERS[key]
+    available_dirs = _raw_dirs()
     lower_dirs = [d.lower() for d in available_dirs]
     for pat in patterns:
         pat_lower = pat.lower()
         for dir_name, dir_lower in zip(available_dirs, lower_dirs):
             if dir_lower.startswith(pat_lower):
+                _RESOLVED_FOLDERS[key] = dir_name
                 return dir_name
     msg = (
         f"No folder found starting with any of {patterns} in {RAW}\n"
@@ -26,9 +63,10 @@ def resolve_folder(patterns: list[str]) -> str:
     )
     raise FileNotFoundError(msg)
 
-def load_latest_csv(folder_or_patterns) -> pd.DataFrame:
+def load_latest_csv(folder_or_patterns, log=print) -> pd.DataFrame:
     """
     folder_or_patterns: Either a string (exact folder name) or a list of patterns (see resolve_folder).
+    log: Receives the progress message naming the file that was picked.
     Returns DataFrame from latest CSV in resolved folder.
     """
     resolved_folder = None
@@ -38,19 +76,44 @@ def load_latest_csv(folder_or_patterns) -> pd.DataFrame:
     else:
         folder_path = RAW / folder_or_patterns
         resolved_folder = folder_or_patterns
-    csv_files = list(folder_path.glob("*.csv"))
-    if not csv_files:
-        available = [f.name for f in folder_path.iterdir() if f.is_file()]
+    # Single pass over the listing, keeping the newest CSV (the first one on ties).
+    # Hidden files such as macOS "._export.csv" resource forks are never exports.
+    latest_path, latest_mtime = None, -1.0
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if entry.name.startswith(".") or not entry.name.endswith(".csv"):
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime > latest_mtime:
+                latest_path, latest_mtime = entry.path, mtime
+    if latest_path is None:
+        with os.scandir(folder_path) as it:
+            available = [entry.name for entry in it if entry.is_file()]
         raise FileNotFoundError(
             f"No CSV files found in {folder_path} (Resolved folder: '{resolved_folder}')\n"
             f"Available files: {available}"
         )
-    latest_file = max(csv_files, key=lambda f: f.stat().st_mtime)
-    print(f"[INFO] Using latest file for {resolved_folder}: {latest_file.name}")
-    df = pd.read_csv(latest_file)
+    latest_file = Path(latest_path)
+    log(f"[INFO] Using latest file for {resolved_folder}: {latest_file.name}")
+    df = read_csv_mmap(latest_file)
     df["source"] = resolved_folder
     return df
 
+def _process(target) -> list[str]:
+    """Extract one (folder_or_patterns, outfile) target; returns its log lines."""
+    folder_or_patterns, outfile = target
+    lines: list[str] = []
+    try:
+        df = load_latest_csv(folder_or_patterns, log=lines.append)
+        (PROCESSED / outfile).parent.mkdir(parents=True, exist_ok=True)
+        write_processed(df, PROCESSED / outfile)
+        lines.append(f"[OK] Saved {outfile}")
+    except FileNotFoundError as e:
+        lines.append(f"[WARN] {e}")
+    except Exception as e:
+        lines.append(f"[ERROR] Failed for {folder_or_patterns}: {e}")
+    return lines
+
 if __name__ == "__main__":
     targets = [
         ("Content_Ai-talks-CA", "content_clean_ready.csv"),
@@ -60,16 +123,13 @@ if __name__ == "__main__":
         ("Date_Ai-talks-CA", "date_clean_ready.csv"),
     ]
 
-    for folder_or_patterns, outfile in targets:
-        try:
-            df = load_latest_csv(folder_or_patterns)
-            (PROCESSED / outfile).parent.mkdir(parents=True, exist_ok=True)
-            df.to_csv(PROCESSED / outfile, index=False)
-            print(f"[OK] Saved {outfile}")
-        except FileNotFoundError as e:
-            print(f"[WARN] {e}")
-        except Exception as e:
-            print(f"[ERROR] Failed for {folder_or_patterns}: {e}")
+    # Targets share nothing and write distinct files; CSV parsing and writing release
+    # the GIL, so threads overlap them. Logs are printed in target order afterwards.
+    _raw_dirs()  # fill the shared folder listing before the workers read it
+    with ThreadPoolExecutor(max_workers=min(len(targets), os.cpu_count() or 1)) as pool:
+        for lines in pool.map(_process, targets):
+            for line in lines:
+                print(line)
 
     print("All available latest CSVs processed → data/processed/")
 
@@ -77,96 +137,192 @@ if __name__ == "__main__":
     # --- Post-clean standardization for EDA ---
 # This makes the processed CSVs consistent (column names & types) regardless of upstream variations.
 
-import os
-import pandas as pd
-from pathlib import Path
+def _rename_if_exists(df: pd.DataFrame, mapping: dict):
+    """
+    Relabel `df`'s columns in place (only the column index is replaced; the data is
+    not copied). Returns (df, whether any column label actually changed).
+    """
+    rename_map = {old: new for old, new in mapping.items() if old in df.columns and old != new}
+    if rename_map:
+        df.columns = [rename_map.get(col, col) for col in df.columns]
+    return df, bool(rename_map)
 
-try:
-    from scripts.config import FILES, DATA_PROCESSED
-except ModuleNotFoundError:
-    from config import FILES, DATA_PROCESSED
+def _rename_header(path: Path, mapping: dict) -> bool:
+    """
+    Apply `mapping` (like _rename_if_exists) by rewriting only the CSV header line;
+    the data rows are copied through byte for byte. Returns False, without touching
+    the file, when no column needs renaming.
+    """
+    path = Path(path)
+    with open(path, "rb") as src:
+        first = src.readline()
+        header = next(csv.reader([first.decode("utf-8-sig")]), [])
+        renamed = [mapping.get(col, col) for col in header]
+        if renamed == header:
+            return False
+        pq_path = fresh_parquet(path)
+        line = io.StringIO()
+        csv.writer(line, lineterminator="\r\n" if first.endswith(b"\r\n") else "\n").writerow(renamed)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as dst:
+            dst.write(line.getvalue().encode("utf-8"))
+            shutil.copyfileobj(src, dst)
+    os.replace(tmp, path)
+    # keep the Parquet copy in step with the CSV (re-tagged with it, so it stays fresh)
+    if pq_path is not None:
+        rename_parquet_columns(path, renamed)
+    elif PROCESSED_FMT == "parquet" and HAVE_ARROW:
+        csv_to_parquet(path)
+    return True
 
-def _rename_if_exists(df: pd.DataFrame, mapping: dict):
-    rename_map = {old: new for old, new in mapping.items() if old in df.columns}
-    return df.rename(columns=rename_map)
+def _file_meta() -> dict:
+    """
+    For each FILES entry: (path, fingerprint or None for a missing file, whether its
+    schema stamp exists), gathered with one scandir pass per folder instead of a stat
+    per file.
+    """
+    listings: dict = {}
+    meta = {}
+    for name, path in FILES.items():
+        path = Path(path)
+        if path.parent not in listings:
+            try:
+                with os.scandir(path.parent) as entries:
+                    listings[path.parent] = {
+                        entry.name: entry.stat() for entry in entries if entry.is_file()
+                    }
+            except FileNotFoundError:
+                listings[path.parent] = {}
+        listing = listings[path.parent]
+        st = listing.get(path.name)
+        meta[name] = (
+            path,
+            None if st is None else _fingerprint(st),
+            _schema_stamp(path).name in listing,
+        )
+    return meta
+
+def _fingerprint(st: os.stat_result) -> str:
+    """Size and mtime of a file; any replacement, even by an older file, changes it."""
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+def _schema_stamp(path: Path) -> Path:
+    """Sidecar recording the CSV and the rules of a standardization that already ran."""
+    return Path(path).with_suffix(".schema_hash")
+
+def _rules_key(rename_map: dict, coerce) -> str:
+    """Hash of one table's STANDARDIZE_RULES entry, so editing the rules reruns it."""
+    rules = repr((sorted(rename_map.items()), getattr(coerce, "__name__", None)))
+    return hashlib.sha256(rules.encode()).hexdigest()
+
+def _needs_standardizing(path: Path, fingerprint, has_stamp: bool, rules_key: str) -> bool:
+    """False when the stamp records exactly this CSV (size and mtime) and these rules."""
+    if fingerprint is None:
+        return False
+    if not has_stamp:
+        return True
+    return _schema_stamp(path).read_text().strip() != f"{fingerprint} {rules_key}"
+
+def _stamp_standardized(path: Path, rules_key: str) -> None:
+    _schema_stamp(path).write_text(f"{_fingerprint(Path(path).stat())} {rules_key}\n")
+
+def _coerce_dates(df: pd.DataFrame):
+    """
+    Force the dates table's types and drop rows without a date (totals/headers).
+    Returns (frame, whether writing it back would change the CSV).
+    """
+    changed = False
+    # columns the reader already typed (Arrow's inference, or the Parquet copy on
+    # later runs) skip the element-wise conversion pass
+    dates = df["date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        parsed = pd.to_datetime(dates, errors="coerce")
+        # values already in the layout to_csv writes dates in are left as they are
+        # (Arrow hands date-only columns over as datetime.date objects)
+        changed = not (parsed.astype(str).to_numpy() == dates.astype(str).to_numpy()).all()
+        df["date"] = parsed
+    if "subs_gained" in df.columns:
+        subs = df["subs_gained"]
+        if not pd.api.types.is_numeric_dtype(subs):
+            subs = pd.to_numeric(subs, errors="coerce")
+            changed = True
+        if subs.isna().any():
+            subs = subs.fillna(0)
+            changed = True
+        df["subs_gained"] = subs
+    missing = df["date"].isna()
+    if missing.any():
+        df = df[~missing]
+        changed = True
+    return df, changed
+
+# Per processed table: upstream column name variants -> canonical name, and an
+# optional type coercion. Tables without one only have their header rewritten.
+STANDARDIZE_RULES = {
+    "content": ({
+        "view_count": "views",
+        "views_total": "views",
+        "title": "title",
+        "video_title": "title",
+        "videoId": "video_id",
+        "id": "video_id",
+        "like_count": "likes",
+        "avg_watch_seconds": "avg_view_duration",
+        "avg_view_duration_sec": "avg_view_duration",
+    }, None),
+    "traffic": ({
+        "source": "traffic_source",
+        "traffic_source_type": "traffic_source",
+        "view_count": "views",
+    }, None),
+    "geography": ({
+        "country_name": "country",
+        "country_code": "country",
+        "region": "country",
+        "region_name": "country",
+        "location": "country",
+        "geo": "country",
+        "view_count": "views",
+    }, None),
+    "dates": ({
+        "day": "date",
+        "report_date": "date",
+        "dt": "date",
+        "timestamp": "date",
+        "subscribers_gained": "subs_gained",
+        "subs_added": "subs_gained",
+        "subscribers_added": "subs_gained",
+        "net_subscribers": "subs_gained",
+        "subscribers_net": "subs_gained",
+        "subs": "subs_gained",
+    }, _coerce_dates),
+    # not used in plots yet, but keep it tidy
+    "subscriptions": ({
+        "subscribers_gained": "subs_gained",
+        "subs_added": "subs_gained",
+        "subscribers_added": "subs_gained",
+    }, None),
+}
+
+def _standardize(path: Path, rename_map: dict, coerce=None) -> None:
+    """Rename one processed table's columns and, when `coerce` is given, fix its types."""
+    if coerce is None:
+        _rename_header(path, rename_map)
+        return
+    df, renamed = _rename_if_exists(read_processed(path), rename_map)
+    df, coerced = coerce(df)
+    # an already canonical table is left as is rather than re-encoded
+    if renamed or coerced:
+        write_processed(df, path)
 
 def standardize_processed_schema():
-    # content.csv
-    p = FILES.get("content")
-    if p and Path(p).exists():
-        df = pd.read_csv(p)
-        df = _rename_if_exists(df, {
-            "view_count": "views",
-            "views_total": "views",
-            "title": "title",
-            "video_title": "title",
-            "videoId": "video_id",
-            "id": "video_id",
-            "like_count": "likes",
-            "avg_watch_seconds": "avg_view_duration",
-            "avg_view_duration_sec": "avg_view_duration",
-        })
-        df.to_csv(p, index=False)
-
-    # traffic.csv
-    p = FILES.get("traffic")
-    if p and Path(p).exists():
-        df = pd.read_csv(p)
-        df = _rename_if_exists(df, {
-            "source": "traffic_source",
-            "traffic_source_type": "traffic_source",
-            "view_count": "views",
-        })
-        df.to_csv(p, index=False)
-
-    # geography.csv
-    p = FILES.get("geography")
-    if p and Path(p).exists():
-        df = pd.read_csv(p)
-        df = _rename_if_exists(df, {
-            "country_name": "country",
-            "country_code": "country",
-            "region": "country",
-            "region_name": "country",
-            "location": "country",
-            "geo": "country",
-            "view_count": "views",
-        })
-        df.to_csv(p, index=False)
-
-    # dates.csv
-    p = FILES.get("dates")
-    if p and Path(p).exists():
-        df = pd.read_csv(p)
-        df = _rename_if_exists(df, {
-            "day": "date",
-            "report_date": "date",
-            "dt": "date",
-            "timestamp": "date",
-            "subscribers_gained": "subs_gained",
-            "subs_added": "subs_gained",
-            "subscribers_added": "subs_gained",
-            "net_subscribers": "subs_gained",
-            "subscribers_net": "subs_gained",
-            "subs": "subs_gained",
-        })
-        # force types
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df = df.dropna(subset=["date"])  # drop totals/headers
-        if "subs_gained" in df.columns:
-            df["subs_gained"] = pd.to_numeric(df["subs_gained"], errors="coerce").fillna(0)
-        df.to_csv(p, index=False)
-
-    # subscriptions.csv (not used in plots yet, but keep it tidy)
-    p = FILES.get("subscriptions")
-    if p and Path(p).exists():
-        df = pd.read_csv(p)
-        df = _rename_if_exists(df, {
-            "subscribers_gained": "subs_gained",
-            "subs_added": "subs_gained",
-            "subscribers_added": "subs_gained",
-        })
-        df.to_csv(p, index=False)
+    meta = _file_meta()
+    for name, (rename_map, coerce) in STANDARDIZE_RULES.items():
+        p, fingerprint, has_stamp = meta[name]
+        rules_key = _rules_key(rename_map, coerce)
+        if _needs_standardizing(p, fingerprint, has_stamp, rules_key):
+            _standardize(p, rename_map, coerce)
+            _stamp_standardized(p, rules_key)
 
 # Run standardization automatically unless disabled
 if __name__ == "__main__":
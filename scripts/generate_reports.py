@@ -1,58 +1,109 @@
 from __future__ import annotations
 
 import csv
+import importlib.util
+import io
+import os
 from pathlib import Path
-import sqlite3
-import pandas as pd
+from typing import Dict, Optional, Set
 
-# Optional libraries for PDF and PPTX
-try:
-    from reportlab.lib.pagesizes import LETTER
-    from reportlab.pdfgen import canvas
-    HAVE_PDF = True
-except Exception:
-    HAVE_PDF = False
+import pandas as pd
 
-try:
-    from pptx import Presentation
-    from pptx.util import Inches
-    HAVE_PPTX = True
-except Exception:
-    HAVE_PPTX = False
+# Optional libraries for PDF and PPTX. Only their presence is checked here; each
+# is imported by the one function that uses it, so a run that stops at the data
+# dictionary does not load them. An installed copy that fails to import is
+# skipped like a missing one.
+HAVE_PDF = importlib.util.find_spec("reportlab") is not None
+HAVE_PPTX = importlib.util.find_spec("pptx") is not None
 
 try:
-    from scripts.config import ROOT, FILES, REPORTS_DIR, FIGURES_DIR
+    from scripts.config import FILES, REPORTS_DIR, FIGURES_DIR
+    from scripts.io_utils import HAVE_ARROW, csv_schema, fresh_parquet, parquet_path, pq
 except ModuleNotFoundError:
-    from config import ROOT, FILES, REPORTS_DIR, FIGURES_DIR
+    from config import FILES, REPORTS_DIR, FIGURES_DIR
+    from io_utils import HAVE_ARROW, csv_schema, fresh_parquet, parquet_path, pq
+
+# Core figures placed in both the PDF summary and the PPTX deck, in order
+REPORT_FIGURES = [
+    ("Top Videos by Views", "top_videos_by_views.png"),
+    ("Traffic Sources", "traffic_sources.png"),
+    ("Top Countries", "top_countries.png"),
+    ("Views Over Time", "views_over_time.png"),
+    ("Subscriber Breakdown", "subscriber_breakdown.png"),
+]
+
+
+def load_kpis(kpis_csv: Path) -> Optional[Dict[str, str]]:
+    """First row of kpis.csv as a dict, or None when eda_youtube.py has not written it."""
+    try:
+        with open(kpis_csv, newline="", encoding="utf-8") as fh:
+            return next(csv.DictReader(fh), {})
+    except FileNotFoundError:
+        return None
 
-DB_PATH = ROOT / "data" / "ai_talks.sqlite"
+
+def _dir_index(dir_path: Path) -> Set[str]:
+    """Entry names of `dir_path` from one os.scandir; empty when the directory is missing."""
+    try:
+        with os.scandir(dir_path) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def existing_figures() -> Dict[str, Path]:
+    """REPORT_FIGURES present in FIGURES_DIR, found with a single directory listing."""
+    present = _dir_index(FIGURES_DIR)
+    return {name: FIGURES_DIR / name for _, name in REPORT_FIGURES if name in present}
 
 
 def generate_data_dictionary(out_path: Path) -> None:
     rows = []
+    # one listing per directory holding FILES, instead of a stat per file
+    listings = {parent: _dir_index(parent) for parent in {Path(path).parent for path in FILES.values()}}
     for name, path in FILES.items():
         p = Path(path)
-        if not p.exists():
+        present = listings[p.parent]
+        pq_path = fresh_parquet(p) if parquet_path(p).name in present else None
+        if pq_path is not None:
+            # the Parquet footer carries the schema; no rows are read
+            columns = [(field.name, str(field.type)) for field in pq.read_schema(str(pq_path))]
+        elif p.name not in present:
             continue
-        df = pd.read_csv(p, nrows=100)
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            rows.append({
-                "table": name,
-                "column": col,
-                "dtype": dtype,
-                "description": "",
-            })
+        elif HAVE_ARROW:
+            # Arrow infers the types from the first block; no DataFrame is built
+            columns = [(field.name, str(field.type)) for field in csv_schema(p)]
+        else:
+            df = pd.read_csv(p, nrows=100)
+            columns = [(col, str(df[col].dtype)) for col in df.columns]
+        rows.extend((name, col, dtype, "") for col, dtype in columns)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    pd.DataFrame(rows).to_csv(out_path, index=False)
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        writer = csv.writer(fh, lineterminator="\n")
+        writer.writerow(("table", "column", "dtype", "description"))
+        writer.writerows(rows)
 
 
-def generate_executive_summary_pdf(out_path: Path) -> None:
+def generate_executive_summary_pdf(
+    out_path: Path,
+    kpis: Optional[Dict[str, str]] = None,
+    figures: Optional[Dict[str, Path]] = None,
+) -> None:
     if not HAVE_PDF:
         print("[WARN] reportlab not installed; skipping PDF.")
         return
-    kpis_csv = REPORTS_DIR / "kpis.csv"
-    kpis = pd.read_csv(kpis_csv) if kpis_csv.exists() else pd.DataFrame()
+    try:
+        from reportlab.lib.pagesizes import LETTER
+        from reportlab.lib.utils import ImageReader
+        from reportlab.pdfgen import canvas
+    except ImportError as exc:
+        print(f"[WARN] reportlab failed to import ({exc}); skipping PDF.")
+        return
+
+    if kpis is None:
+        kpis = load_kpis(REPORTS_DIR / "kpis.csv")
+    if figures is None:
+        figures = existing_figures()
 
     c = canvas.Canvas(str(out_path), pagesize=LETTER)
     width, height = LETTER
@@ -61,10 +112,10 @@ def generate_executive_summary_pdf(out_path: Path) -> None:
     c.drawString(72, y, "AI Talks Campaign Executive Summary")
     y -= 24
     c.setFont("Helvetica", 10)
-    if not kpis.empty:
-        for key in kpis.columns:
+    if kpis:
+        for key, value in kpis.items():
             y -= 14
-            c.drawString(72, y, f"{key}: {kpis.iloc[0][key]}")
+            c.drawString(72, y, f"{key}: {value}")
     else:
         y -= 14
         c.drawString(72, y, "KPIs not available. Run eda_youtube.py to generate kpis.csv.")
@@ -73,32 +124,47 @@ def generate_executive_summary_pdf(out_path: Path) -> None:
     c.setFont("Helvetica-Bold", 12)
     c.drawString(72, y, "Key Visuals")
     y -= 12
-    # Place a few core figures if present
-    figures = [
-        FIGURES_DIR / "top_videos_by_views.png",
-        FIGURES_DIR / "traffic_sources.png",
-        FIGURES_DIR / "top_countries.png",
-        FIGURES_DIR / "views_over_time.png",
-        FIGURES_DIR / "subscriber_breakdown.png",
-    ]
-    for fig in figures:
-        if fig.exists():
-            y -= 200
+    # Place a few core figures if present; each PNG is opened and decoded once by
+    # its ImageReader, however often it is drawn
+    images = {}
+    for name, fig in figures.items():
+        try:
+            images[name] = ImageReader(str(fig))
+        except Exception:
+            images[name] = None
+    for image in images.values():
+        y -= 200
+        if image is not None:
             try:
-                c.drawImage(str(fig), 72, max(y, 72), width=width-144, height=180, preserveAspectRatio=True, anchor='n')
+                c.drawImage(image, 72, max(y, 72), width=width-144, height=180, preserveAspectRatio=True, anchor='n')
             except Exception:
                 pass
-            if y < 100:
-                c.showPage()
-                y = height - 72
+        if y < 100:
+            c.showPage()
+            y = height - 72
     c.showPage()
     c.save()
 
 
-def generate_insights_pptx(out_path: Path) -> None:
+def generate_insights_pptx(
+    out_path: Path,
+    kpis: Optional[Dict[str, str]] = None,
+    figures: Optional[Dict[str, Path]] = None,
+) -> None:
     if not HAVE_PPTX:
         print("[WARN] python-pptx not installed; skipping PPTX.")
         return
+    try:
+        from pptx import Presentation
+        from pptx.util import Inches
+    except ImportError as exc:
+        print(f"[WARN] python-pptx failed to import ({exc}); skipping PPTX.")
+        return
+
+    if kpis is None:
+        kpis = load_kpis(REPORTS_DIR / "kpis.csv")
+    if figures is None:
+        figures = existing_figures()
     prs = Presentation()
     title_slide_layout = prs.slide_layouts[0]
     slide = prs.slides.add_slide(title_slide_layout)
@@ -106,33 +172,30 @@ def generate_insights_pptx(out_path: Path) -> None:
     slide.placeholders[1].text = "Auto-generated deck with KPIs and key visuals"
 
     # KPIs slide
-    kpis_csv = REPORTS_DIR / "kpis.csv"
-    if kpis_csv.exists():
-        df = pd.read_csv(kpis_csv)
+    if kpis is not None:
         slide = prs.slides.add_slide(prs.slide_layouts[1])
         slide.shapes.title.text = "Key KPIs"
         body = slide.placeholders[1].text_frame
         body.text = ""
-        for col in df.columns:
-            body.add_paragraph().text = f"{col}: {df.iloc[0][col]}"
-
-    # Visuals slides
-    for title, filename in [
-        ("Top Videos by Views", "top_videos_by_views.png"),
-        ("Traffic Sources", "traffic_sources.png"),
-        ("Top Countries", "top_countries.png"),
-        ("Views Over Time", "views_over_time.png"),
-        ("Subscriber Breakdown", "subscriber_breakdown.png"),
-    ]:
-        path = FIGURES_DIR / filename
-        if not path.exists():
+        for col, value in kpis.items():
+            body.add_paragraph().text = f"{col}: {value}"
+
+    # Visuals slides; every figure is read into memory once up front and
+    # add_picture takes the buffer (it rewinds it before reading)
+    images = {}
+    for filename, path in figures.items():
+        with open(path, "rb") as fh:
+            images[filename] = io.BytesIO(fh.read())
+    for title, filename in REPORT_FIGURES:
+        image = images.get(filename)
+        if image is None:
             continue
         slide = prs.slides.add_slide(prs.slide_layouts[5])
         slide.shapes.title.text = title
         left = Inches(1)
         top = Inches(1.5)
         width = Inches(8)
-        slide.shapes.add_picture(str(path), left, top, width=width)
+        slide.shapes.add_picture(image, left, top, width=width)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     prs.save(str(out_path))
@@ -142,10 +205,13 @@ def main() -> None:
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     # Data dictionary
     generate_data_dictionary(REPORTS_DIR / "data_dictionary.csv")
+    # KPIs and figures are shared by the PDF and the deck, so read them once
+    kpis = load_kpis(REPORTS_DIR / "kpis.csv")
+    figures = existing_figures()
     # PDF summary
-    generate_executive_summary_pdf(REPORTS_DIR / "executive_summary.pdf")
+    generate_executive_summary_pdf(REPORTS_DIR / "executive_summary.pdf", kpis, figures)
     # PPTX deck
-    generate_insights_pptx(REPORTS_DIR / "insights_presentation.pptx")
+    generate_insights_pptx(REPORTS_DIR / "insights_presentation.pptx", kpis, figures)
     print("Reports generated under /reports")
 
 
@@ -0,0 +1,238 @@
+"""Parquet copies of the processed CSVs and the helpers that locate them.
+
+The CSVs in data/processed/ stay the canonical interchange format (they are what
+extract_from_youtube.py writes and what SQL/load_data.sql imports). When pyarrow
+is installed, each one can be mirrored as a zstd-compressed Parquet file next
+to it (written alongside the CSV when config.PROCESSED_FMT is "parquet"); readers
+use that copy while its CSV still has the size and mtime recorded in the copy, which
+skips text parsing and keeps the column types.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    HAVE_ARROW = True
+except ModuleNotFoundError:  # pyarrow is optional
+    pa = None  # type: ignore
+    pa_csv = None  # type: ignore
+    pq = None  # type: ignore
+    HAVE_ARROW = False
+
+try:
+    from scripts.config import FILES, PROCESSED_FMT
+except ModuleNotFoundError:  # allow running as a module or script
+    from config import FILES, PROCESSED_FMT
+
+PARQUET_COMPRESSION = "zstd"
+
+# Parquet metadata key holding the "<size>-<mtime_ns>" of the CSV a copy mirrors.
+# Only an exact match counts as fresh: a CSV replaced by an older file (cp -p,
+# unzip, git checkout) must not be shadowed by a newer-looking copy.
+_SOURCE_KEY = b"ai_talks.source_csv"
+
+# Write buffer for processed CSVs; large enough that to_csv's row chunks reach the
+# OS in a few big writes instead of one per 8 KiB
+CSV_WRITE_BUFFER = 4 << 20
+
+# Only an empty field is missing, as in build_db's csv.reader path; "NA" (Namibia's
+# country code), "null" and the like stay text whichever reader sees the file.
+_ARROW_NULLS = {"null_values": [""], "strings_can_be_null": True}
+_PANDAS_NULLS = {"keep_default_na": False, "na_values": [""]}
+
+# Arrow CSV conversion for whole-table reads that may be written back with to_csv:
+# timestamps are only inferred in the one layout pandas writes out unchanged, so
+# e.g. ISO "T"-separated values keep their original text.
+_ARROW_CONVERT = (
+    pa_csv.ConvertOptions(timestamp_parsers=["%Y-%m-%d %H:%M:%S"], **_ARROW_NULLS)
+    if HAVE_ARROW
+    else None
+)
+
+# pd.read_csv options for whole-file reads: Arrow's multithreaded parser when
+# available, otherwise the C engine without its low-memory type guessing.
+CSV_READ_KWARGS = (
+    {"engine": "pyarrow", **_PANDAS_NULLS}
+    if HAVE_ARROW
+    else {"engine": "c", "low_memory": False, "cache_dates": True, **_PANDAS_NULLS}
+)
+
+
+def dedupe_columns(names: Sequence[str]) -> List[str]:
+    """Make repeated column names unique the way pandas' CSV parser does ("x", "x.1", ...).
+
+    Arrow keeps duplicate names as they are, but a Parquet file with them cannot be
+    read back by name; processed CSVs can hold them after a many-to-one rename.
+    """
+    counts: dict = {}
+    unique = []
+    for name in names:
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        unique.append(name)
+        counts[name] = count + 1
+    return unique
+
+
+def _dedupe_table(table: "pa.Table") -> "pa.Table":
+    names = dedupe_columns(table.column_names)
+    return table if names == table.column_names else table.rename_columns(names)
+
+
+def parquet_path(csv_path: Path) -> Path:
+    """Location of the Parquet copy kept next to a processed CSV."""
+    return Path(csv_path).with_suffix(".parquet")
+
+
+def _csv_stamp(csv_path: Path) -> bytes:
+    """Size and mtime of a CSV, the fingerprint cache_utils.file_key uses too."""
+    st = Path(csv_path).stat()
+    return f"{st.st_size}-{st.st_mtime_ns}".encode()
+
+
+def _write_copy(table: "pa.Table", csv_path: Path, stamp: bytes) -> None:
+    """Write `table` as the Parquet copy of `csv_path`, tagged with the CSV's `stamp`."""
+    metadata = {**(table.schema.metadata or {}), _SOURCE_KEY: stamp}
+    pq.write_table(
+        table.replace_schema_metadata(metadata),
+        str(parquet_path(csv_path)),
+        compression=PARQUET_COMPRESSION,
+    )
+
+
+def fresh_parquet(csv_path: Path) -> Optional[Path]:
+    """Return the readable Parquet copy of `csv_path`, or None if it is absent or stale."""
+    if not HAVE_ARROW:
+        return None
+    pq_path = parquet_path(csv_path)
+    try:
+        metadata = pq.read_schema(str(pq_path)).metadata or {}
+    except FileNotFoundError:
+        return None
+    try:
+        stamp = _csv_stamp(csv_path)
+    except FileNotFoundError:
+        return pq_path
+    return pq_path if metadata.get(_SOURCE_KEY) == stamp else None
+
+
+def parquet_columns(path: Path) -> List[str]:
+    """Column names of a Parquet file, read from its footer only."""
+    return pq.read_schema(str(path)).names
+
+
+def csv_schema(path: Path) -> "pa.Schema":
+    """Column names and Arrow types of a CSV, inferred from its first block only."""
+    with pa_csv.open_csv(str(path), convert_options=pa_csv.ConvertOptions(**_ARROW_NULLS)) as reader:
+        return reader.schema
+
+
+def iter_parquet(path: Path, columns: Sequence[str], batch_size: int) -> Iterator[pd.DataFrame]:
+    """Yield `columns` of a Parquet file as DataFrames of at most `batch_size` rows."""
+    for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size, columns=list(columns)):
+        yield batch.to_pandas()
+
+
+def iter_csv_arrow(path: Path, columns: Sequence[str]) -> Iterator[pd.DataFrame]:
+    """Stream `columns` of a CSV through Arrow's reader, one DataFrame of text per parsed block.
+
+    The streaming reader fixes column types from the first block, so a later row of
+    another type (a decimal, a "Total" line) would abort the read; every column is
+    read as text instead and left for the caller to coerce.
+    """
+    convert = pa_csv.ConvertOptions(
+        include_columns=list(columns),
+        column_types={col: pa.string() for col in columns},
+        **_ARROW_NULLS,
+    )
+    for batch in pa_csv.open_csv(str(path), convert_options=convert):
+        yield batch.to_pandas()
+
+
+def csv_to_parquet(csv_path: Path) -> Path:
+    """Parse `csv_path` once with Arrow and write its Parquet copy.
+
+    Types are inferred like read_csv_mmap does, so a reader sees the same columns
+    whether it gets the copy or the CSV.
+    """
+    stamp = _csv_stamp(csv_path)  # taken first, so a CSV changed mid-read reads as stale
+    table = _dedupe_table(pa_csv.read_csv(str(csv_path), convert_options=_ARROW_CONVERT))
+    _write_copy(table, csv_path, stamp)
+    return parquet_path(csv_path)
+
+
+def rename_parquet_columns(csv_path: Path, names: Sequence[str]) -> None:
+    """Relabel the columns of `csv_path`'s Parquet copy in place after its CSV header changed.
+
+    Column data is carried over as is and the copy is re-tagged with the rewritten CSV.
+    Repeated names are made unique with dedupe_columns, matching how the CSV reads back.
+    """
+    # pandas metadata records the old labels, so it is dropped with them
+    table = (
+        pq.read_table(str(parquet_path(csv_path)))
+        .rename_columns(dedupe_columns(names))
+        .replace_schema_metadata(None)
+    )
+    _write_copy(table, csv_path, _csv_stamp(csv_path))
+
+
+def read_csv_mmap(path: Path) -> pd.DataFrame:
+    """Read a whole CSV with Arrow's parser over a memory map (pandas' C parser without pyarrow)."""
+    if not HAVE_ARROW:
+        return pd.read_csv(path, **CSV_READ_KWARGS)
+    with pa.memory_map(str(path), "r") as source:
+        table = _dedupe_table(pa_csv.read_csv(source, convert_options=_ARROW_CONVERT))
+    # self_destruct frees each Arrow column once converted; `table` is not used again
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_processed(csv_path: Path) -> pd.DataFrame:
+    """Read a processed table, from its fresh Parquet copy when there is one."""
+    pq_path = fresh_parquet(csv_path)
+    if pq_path is not None:
+        return pd.read_parquet(pq_path, engine="pyarrow")
+    return read_csv_mmap(csv_path)
+
+
+def write_processed(df: pd.DataFrame, csv_path: Path) -> None:
+    """Write a processed table as CSV plus, per PROCESSED_FMT, its Parquet copy.
+
+    The copy is tagged with the CSV as written, so fresh_parquet() accepts it.
+    """
+    csv_path = Path(csv_path)
+    with open(csv_path, "w", newline="", encoding="utf-8", buffering=CSV_WRITE_BUFFER) as fh:
+        df.to_csv(fh, index=False)
+    if PROCESSED_FMT != "parquet" or not HAVE_ARROW:
+        return
+    try:
+        _write_copy(pa.Table.from_pandas(df, preserve_index=False), csv_path, _csv_stamp(csv_path))
+    except (pa.ArrowException, ValueError, TypeError):
+        # e.g. a text column that also holds numbers; readers fall back to the CSV
+        parquet_path(csv_path).unlink(missing_ok=True)
+
+
+def convert_processed() -> List[Path]:
+    """Mirror every processed CSV declared in config.FILES as Parquet."""
+    written = []
+    for path in FILES.values():
+        if Path(path).exists():
+            written.append(csv_to_parquet(path))
+    return written
+
+
+if __name__ == "__main__":
+    if not HAVE_ARROW:
+        print("[WARN] pyarrow not installed; skipping Parquet conversion.")
+    else:
+        for out in convert_processed():
+            print(f"[OK] Wrote {out}")
@@ -6,8 +6,12 @@ subtitle, light grid, no chart frame, and value labels on the bars.
 """
 from __future__ import annotations
 
+import os
 from typing import Iterable, Optional
 
+import matplotlib
+
+matplotlib.use("Agg")  # headless backend suitable for CLI/CI usage
 import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
@@ -29,6 +33,11 @@ PALETTE = {
 }
 
 
+# Output resolution. PNG encode time scales with pixel count, so quick drafts can
+# set e.g. AI_TALKS_FIG_DPI=110 for a quarter of the pixels.
+SAVEFIG_DPI = int(os.environ.get("AI_TALKS_FIG_DPI", "220"))
+
+
 # --------------------------------------------------------------------------- #
 # Theme
 # --------------------------------------------------------------------------- #
@@ -77,7 +86,7 @@ def apply_theme() -> None:
         # Figure
         "figure.facecolor": PALETTE["bg"],
         "figure.dpi": 110,
-        "savefig.dpi": 220,
+        "savefig.dpi": SAVEFIG_DPI,
         "savefig.facecolor": PALETTE["bg"],
         "savefig.bbox": "tight",
         "savefig.pad_inches": 0.35,
@@ -88,6 +97,30 @@ def apply_theme() -> None:
     })
 
 
+# --------------------------------------------------------------------------- #
+# Figure lifecycle
+# --------------------------------------------------------------------------- #
+_SHARED_FIG: Optional[Figure] = None
+# pyplot label of the figure set_wide() reuses for legacy pyplot-style charts
+_WIDE_FIG_LABEL = "ai-talks-wide"
+
+
+def new_figure(figsize: tuple[float, float]) -> tuple[Figure, Axes]:
+    """Return the shared report Figure, cleared and resized, with one fresh Axes.
+
+    Charts are rendered one at a time, so a single Figure kept outside pyplot's
+    figure manager is reused instead of building a new figure and canvas per chart.
+    Call apply_theme() first; the Figure picks up the theme when it is created.
+    """
+    global _SHARED_FIG
+    if _SHARED_FIG is None:
+        _SHARED_FIG = Figure()
+    fig = _SHARED_FIG
+    fig.clear()
+    fig.set_size_inches(figsize)
+    return fig, fig.add_subplot()
+
+
 # --------------------------------------------------------------------------- #
 # Helpers
 # --------------------------------------------------------------------------- #
@@ -183,9 +216,14 @@ def annotate_bars_h(
 # Back-compat shims (kept so existing callers don't break while we migrate)
 # --------------------------------------------------------------------------- #
 def set_wide(figsize=(14, 6), title=None, xlabel=None, ylabel=None, rotate_x=0):
-    """Legacy entrypoint. Prefer building figures explicitly with apply_theme()."""
+    """Legacy entrypoint. Prefer building figures explicitly with apply_theme().
+
+    Every call reuses (clears and resizes) the same pyplot figure.
+    """
     apply_theme()
-    plt.figure(figsize=figsize)
+    fig = plt.figure(num=_WIDE_FIG_LABEL)
+    fig.clear()
+    fig.set_size_inches(figsize)
     if title:
         plt.title(title)
     if xlabel:
@@ -196,7 +234,16 @@ def set_wide(figsize=(14, 6), title=None, xlabel=None, ylabel=None, rotate_x=0):
         plt.xticks(rotation=rotate_x)
 
 
-def savefig(path):
-    """Save without invoking tight_layout — callers manage axes via subplots_adjust."""
-    plt.savefig(path)
-    plt.close()
+def savefig(path, fig: Optional[Figure] = None):
+    """Save without invoking tight_layout — callers manage axes via subplots_adjust.
+
+    Defaults to the current pyplot figure. Shared figures (new_figure, set_wide)
+    are cleared for reuse after saving; any other figure is closed.
+    """
+    if fig is None:
+        fig = plt.gcf()
+    fig.savefig(path)
+    if fig is _SHARED_FIG or fig.get_label() == _WIDE_FIG_LABEL:
+        fig.clear()
+    else:
+        plt.close(fig)
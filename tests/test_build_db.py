@@ -0,0 +1,112 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from scripts import build_db
+
+
+@pytest.fixture
+def table_map(tmp_path, monkeypatch):
+    """TABLE_MAP pointed at small processed CSVs under tmp_path."""
+    csvs = {
+        "content": "Content,Video title,Views from playlist,Duration\nabc,Talk A,10,100\n",
+        "traffic": "Traffic source,Views\nExternal,7\n",
+        "geography": "Geography,Views\nUS,4\n",
+        "subscriptions": "Subscription status,Views\nSubscribed,1\n",
+        "dates": "date,Views\n2025-02-04,10\n",
+    }
+    tables = {}
+    for key, text in csvs.items():
+        path = tmp_path / f"{key}.csv"
+        path.write_text(text)
+        tables[key] = {**build_db.TABLE_MAP[key], "path": path}
+    monkeypatch.setattr(build_db, "TABLE_MAP", tables)
+    return tables
+
+
+def _contents(db_path):
+    with closing(sqlite3.connect(db_path)) as con:
+        return {
+            table: con.execute(f'SELECT * FROM "{table}"').fetchall()
+            for table in ("content", "traffic", "geography", "subscriptions", "dates")
+        }
+
+
+def test_build_loads_every_table(tmp_path, table_map):
+    db_path = tmp_path / "ai_talks.sqlite"
+    build_db.build_sqlite(db_path)
+    contents = _contents(db_path)
+    assert contents["content"] == [("abc", "Talk A", 10, None, 100.0)]
+    assert contents["traffic"] == [("External", 7)]
+    assert contents["dates"] == [("2025-02-04 00:00:00", 10)]
+
+
+def test_failed_build_keeps_previous_database(tmp_path, table_map, monkeypatch):
+    db_path = tmp_path / "ai_talks.sqlite"
+    build_db.build_sqlite(db_path)
+    before = _contents(db_path)
+
+    # new inputs, then a failure after `content` has been rebuilt in the same run
+    table_map["content"]["path"].write_text("Content,Video title\nnew,New talk\n")
+
+    def fail(con, meta):
+        raise RuntimeError("simulated failure mid-load")
+
+    monkeypatch.setattr(build_db, "_bulk_insert_csv", fail)
+    with pytest.raises(RuntimeError, match="mid-load"):
+        build_db.build_sqlite(db_path)
+    assert _contents(db_path) == before
+
+
+def test_build_leaves_no_wal_files(tmp_path, table_map):
+    db_path = tmp_path / "ai_talks.sqlite"
+    build_db.build_sqlite(db_path)
+    with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+        con.execute('SELECT COUNT(*) FROM "content"').fetchone()
+    assert sorted(p.name for p in tmp_path.glob("ai_talks.sqlite*")) == ["ai_talks.sqlite"]
+
+
+def test_type_change_after_first_block(tmp_path, table_map):
+    # enough rows that the odd ones fall past the first block of Arrow's streaming reader
+    rows = "".join(f"v{i},Talk {i},{i},{i % 300}\n" for i in range(60_000))
+    table_map["content"]["path"].write_text(
+        "Content,Video title,Views from playlist,Duration\n" + rows + "late,Late talk,n/a,12.5\n"
+    )
+    table_map["dates"]["path"].write_text(
+        "date,Views\n" + "".join(f"2025-02-04,{i}\n" for i in range(60_000)) + "Total,60000\n"
+    )
+    db_path = tmp_path / "ai_talks.sqlite"
+    build_db.build_sqlite(db_path)
+
+    with closing(sqlite3.connect(db_path)) as con:
+        assert con.execute("SELECT COUNT(*) FROM content").fetchone() == (60_001,)
+        assert con.execute(
+            "SELECT views, avg_view_duration FROM content WHERE video_id = 'late'"
+        ).fetchone() == (None, 12.5)
+        assert con.execute("SELECT COUNT(*), COUNT(date) FROM dates").fetchone() == (60_001, 60_000)
+
+
+def test_text_null_tokens_are_kept_on_every_path(tmp_path, table_map):
+    # "NA" is Namibia's country code; only an empty field is missing
+    table_map["content"]["path"].write_text(
+        "Content,Video title,Views from playlist,Duration\nNA,,10,100\nnull,N/A,,\n"
+    )
+    table_map["geography"]["path"].write_text("Geography,Views\nNA,4\n,5\n")
+    db_path = tmp_path / "ai_talks.sqlite"
+    build_db.build_sqlite(db_path)
+    contents = _contents(db_path)
+    assert contents["content"] == [("NA", None, 10, None, 100.0), ("null", "N/A", None, None, None)]
+    assert contents["geography"] == [("NA", 4), (None, 5)]
+
+
+def test_parquet_copies_load_like_the_csvs(tmp_path, table_map):
+    pytest.importorskip("pyarrow")
+    from scripts import io_utils
+
+    build_db.build_sqlite(tmp_path / "from_csv.sqlite")
+    for meta in table_map.values():
+        io_utils.csv_to_parquet(meta["path"])
+    build_db.build_sqlite(tmp_path / "from_parquet.sqlite")
+    assert _contents(tmp_path / "from_parquet.sqlite") == _contents(tmp_path / "from_csv.sqlite")
@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scripts import cache_utils
+
+
+def test_cache_is_keyed_on_read_options(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_utils, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(cache_utils, "ENABLED", True)
+    csv_path = tmp_path / "dates.csv"
+    csv_path.write_text("date,Views\n2025-02-04,10\n")
+    reads = []
+
+    def read(path, **kwargs):
+        reads.append(kwargs)
+        return pd.read_csv(path, **kwargs)
+
+    plain = cache_utils.load_with_cache(csv_path, read, key="plain")
+    assert cache_utils.load_with_cache(csv_path, read, key="plain").equals(plain)
+    parsed = cache_utils.load_with_cache(
+        csv_path, lambda p: read(p, parse_dates=["date"]), key="parse_dates"
+    )
+    assert len(reads) == 2
+    assert plain["date"].dtype == object
+    assert pd.api.types.is_datetime64_any_dtype(parsed["date"])
@@ -0,0 +1,60 @@
+import pytest
+
+from scripts import build_db, cache_utils, eda_youtube
+
+CSVS = {
+    "content": (
+        "Content,Video title,Views from playlist,Duration,likes\n"
+        "abc,Talk A,10,100,\nxyz,Talk B,5,50,\nabc,Talk A,1,10,\n"
+    ),
+    "traffic": "Traffic source,Views\nExternal,7\n",
+    "geography": "Geography,Views\nUS,4\n",
+    "subscriptions": "Subscription status,Views\nSUBSCRIBED,3\nNot subscribed,1\nOther,\n",
+    "dates": "date,Views\n2025-02-04,10\n",
+}
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    """Processed CSVs under tmp_path, a database built from them, and the loaded frames."""
+    files = {}
+    tables = {}
+    for key, text in CSVS.items():
+        path = tmp_path / f"{key}.csv"
+        path.write_text(text)
+        files[key] = path
+        tables[key] = {**build_db.TABLE_MAP[key], "path": path}
+    monkeypatch.setattr(build_db, "TABLE_MAP", tables)
+    monkeypatch.setattr(eda_youtube, "FILES", files)
+    monkeypatch.setattr(cache_utils, "ENABLED", False)
+    monkeypatch.setattr(eda_youtube, "RESOLVED", {})
+
+    db_path = tmp_path / "ai_talks.sqlite"
+    build_db.build_sqlite(db_path)
+    dfs = eda_youtube.load_data()
+    eda_youtube.validate_inputs(dfs)
+    eda_youtube.categorize_labels(dfs)
+    return db_path, dfs
+
+
+def test_db_kpis_match_pandas_kpis(inputs):
+    db_path, dfs = inputs
+    from_db = eda_youtube.kpi_from_db(dfs, db_path)
+    assert from_db is not None
+    assert from_db.to_csv(index=False) == eda_youtube.kpi_table(dfs).to_csv(index=False)
+
+
+def test_db_is_skipped_when_resolution_differs(inputs, monkeypatch):
+    db_path, dfs = inputs
+    monkeypatch.setitem(eda_youtube.RESOLVED, "content.views", "Duration")
+    assert eda_youtube.kpi_from_db(dfs, db_path) is None
+
+
+def test_db_without_source_table_is_skipped(inputs):
+    db_path, dfs = inputs
+    import sqlite3
+    from contextlib import closing
+
+    with closing(sqlite3.connect(db_path)) as con, con:
+        con.execute("DROP TABLE column_sources")
+    assert eda_youtube.kpi_from_db(dfs, db_path) is None
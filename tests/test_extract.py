@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+from scripts import extract_from_youtube
+
+
+def test_load_latest_csv_skips_hidden_files(tmp_path, monkeypatch):
+    folder = tmp_path / "Content_Ai-talks-CA"
+    folder.mkdir()
+    (folder / "export.csv").write_text("Content,Views\nabc,1\n")
+    hidden = folder / "._export.csv"
+    hidden.write_text("Content,Views\nresource fork,0\n")
+    os.utime(hidden, (2_000_000_000, 2_000_000_000))
+    monkeypatch.setattr(extract_from_youtube, "RAW", tmp_path)
+
+    df = extract_from_youtube.load_latest_csv("Content_Ai-talks-CA", log=lambda msg: None)
+    assert df["Content"].tolist() == ["abc"]
+
+
+def test_standardization_reruns_after_a_file_is_replaced(tmp_path, monkeypatch):
+    files = {name: tmp_path / f"{name}.csv" for name in extract_from_youtube.STANDARDIZE_RULES}
+    monkeypatch.setattr(extract_from_youtube, "FILES", files)
+    dates = files["dates"]
+    dates.write_text("date,subs_gained\n2025-02-04,1\n")
+    extract_from_youtube.standardize_processed_schema()
+    assert extract_from_youtube._schema_stamp(dates).exists()
+
+    # same header, older mtime, but rows the dates rules must still clean up
+    replacement = tmp_path / "export.csv"
+    replacement.write_text("date,subs_gained\n2025-02-04,1\n2025-02-05,\nTotal,1\n")
+    os.utime(replacement, ns=(1_000_000_000, 1_000_000_000))
+    os.replace(replacement, dates)
+    extract_from_youtube.standardize_processed_schema()
+    df = pd.read_csv(dates)
+    assert df["date"].tolist() == ["2025-02-04", "2025-02-05"]
+    assert df["subs_gained"].tolist() == [1, 0]
+
+    # changed rules invalidate the stamp too
+    rename_map, coerce = extract_from_youtube.STANDARDIZE_RULES["dates"]
+    monkeypatch.setitem(
+        extract_from_youtube.STANDARDIZE_RULES, "dates", ({**rename_map, "subs_gained": "subs"}, coerce)
+    )
+    extract_from_youtube.standardize_processed_schema()
+    assert dates.read_text().splitlines()[0] == "date,subs"
@@ -0,0 +1,22 @@
+import sys
+
+import pytest
+
+from scripts import generate_reports
+
+
+@pytest.mark.parametrize(
+    "generate, module, flag",
+    [
+        (generate_reports.generate_executive_summary_pdf, "reportlab.pdfgen", "HAVE_PDF"),
+        (generate_reports.generate_insights_pptx, "pptx", "HAVE_PPTX"),
+    ],
+)
+def test_broken_optional_library_is_skipped(tmp_path, monkeypatch, capsys, generate, module, flag):
+    monkeypatch.setattr(generate_reports, flag, True)
+    monkeypatch.setitem(sys.modules, module, None)  # importing it now raises ImportError
+    out_path = tmp_path / "report.out"
+
+    generate(out_path, {}, {})
+    assert not out_path.exists()
+    assert "failed to import" in capsys.readouterr().out
@@ -0,0 +1,106 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scripts import io_utils
+from scripts.extract_from_youtube import STANDARDIZE_RULES, _rename_header
+
+
+def test_dedupe_columns_matches_pandas_mangling():
+    assert io_utils.dedupe_columns(["a", "b", "a", "a.1", "a"]) == ["a", "b", "a.1", "a.1.1", "a.2"]
+
+
+def test_many_to_one_rename_keeps_parquet_readable(tmp_path):
+    csv_path = tmp_path / "geography_clean_ready.csv"
+    csv_path.write_text("country_code,region,view_count\nUS,North America,4\nIN,Asia,6\n")
+    io_utils.csv_to_parquet(csv_path)
+
+    geography_renames, _ = STANDARDIZE_RULES["geography"]
+    assert _rename_header(csv_path, geography_renames)
+
+    pq_path = io_utils.fresh_parquet(csv_path)
+    assert pq_path is not None
+    from_parquet = pd.read_parquet(pq_path)
+    from_csv = pd.read_csv(csv_path, engine="c")
+    assert list(from_parquet.columns) == ["country", "country.1", "views"]
+    assert list(from_parquet.columns) == list(from_csv.columns)
+    assert list(io_utils.read_processed(csv_path)["country.1"]) == ["North America", "Asia"]
+
+
+def test_csv_replaced_by_an_older_file_is_read_instead_of_its_copy(tmp_path):
+    csv_path = tmp_path / "geography_clean_ready.csv"
+    csv_path.write_text("Geography,Views\nUS,1\n")
+    io_utils.csv_to_parquet(csv_path)
+    assert io_utils.fresh_parquet(csv_path) is not None
+
+    # e.g. `cp -p` or unzip of an export made before the copy was written
+    replacement = tmp_path / "export.csv"
+    replacement.write_text("Geography,Views\nIN,99\nUS,5\n")
+    os.utime(replacement, ns=(1_000_000_000, 1_000_000_000))
+    os.replace(replacement, csv_path)
+
+    assert io_utils.fresh_parquet(csv_path) is None
+    df = io_utils.read_processed(csv_path)
+    assert df.values.tolist() == [["IN", 99], ["US", 5]]
+
+
+def test_written_copy_is_fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(io_utils, "PROCESSED_FMT", "parquet")
+    csv_path = tmp_path / "traffic_clean_ready.csv"
+    io_utils.write_processed(pd.DataFrame({"source": ["External"], "Views": [7]}), csv_path)
+    pq_path = io_utils.fresh_parquet(csv_path)
+    assert pq_path is not None
+    assert pd.read_parquet(pq_path).values.tolist() == [["External", 7]]
+
+
+def test_csv_with_repeated_names_reads_like_the_c_parser(tmp_path):
+    csv_path = tmp_path / "dup.csv"
+    csv_path.write_text("country,country,views\nUS,X,1\n")
+    assert list(io_utils.read_csv_mmap(csv_path).columns) == ["country", "country.1", "views"]
+    pd.read_parquet(io_utils.csv_to_parquet(csv_path))  # readable by name
+
+
+@pytest.mark.parametrize(
+    "dates_csv",
+    [
+        "date,Views\n2025-02-04T10:00:00,1\n2025-02-05T11:30:00,2\n",
+        "date,Views\n2025-02-04T10:00:00,1\n2025-02-05 11:30:00,2\n",
+    ],
+)
+def test_dates_standardize_the_same_with_a_parquet_copy(tmp_path, dates_csv):
+    from scripts.extract_from_youtube import _standardize
+
+    rename_map, coerce = STANDARDIZE_RULES["dates"]
+    outputs = []
+    for with_copy in (False, True):
+        csv_path = tmp_path / f"dates_{with_copy}.csv"
+        csv_path.write_text(dates_csv)
+        if with_copy:
+            io_utils.csv_to_parquet(csv_path)
+        _standardize(csv_path, rename_map, coerce)
+        outputs.append(csv_path.read_text())
+    assert outputs[0] == outputs[1]
+
+
+def test_only_empty_fields_are_missing(tmp_path):
+    csv_path = tmp_path / "geography_clean_ready.csv"
+    csv_path.write_text("country,views\nNA,4\n,5\n")
+    expected = [["NA", 4], [None, 5]]
+    df = io_utils.read_csv_mmap(csv_path)
+    assert df.astype(object).where(df.notna(), None).values.tolist() == expected
+    df = pd.read_parquet(io_utils.csv_to_parquet(csv_path))
+    assert df.astype(object).where(df.notna(), None).values.tolist() == expected
+
+
+def test_fresh_copy_is_read_with_its_types(tmp_path):
+    csv_path = tmp_path / "date_clean_ready.csv"
+    csv_path.write_text("date,Views\n2025-02-04 00:00:00,1\n")
+    pq_path = io_utils.csv_to_parquet(csv_path)
+    assert io_utils.fresh_parquet(csv_path) == pq_path
+
+    df = io_utils.read_processed(csv_path)
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert df["Views"].tolist() == [1]